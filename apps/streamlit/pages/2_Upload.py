@@ -40,8 +40,8 @@ else:
     if uploaded_files and st.button("Save files"):
         saved_assets = []
         for uploaded in uploaded_files:
-            file_bytes = uploaded.getvalue()
-            asset = asset_service.add_asset(subject_id, uploaded.name, file_bytes, uploaded.type)
+            # UploadedFile is file-like; passing it through lets add_asset hash and copy in chunks.
+            asset = asset_service.add_asset(subject_id, uploaded.name, uploaded, uploaded.type)
             saved_assets.append(asset)
         st.success(f"Saved {len(saved_assets)} file(s).")
 
@@ -100,7 +100,7 @@ else:
                         st.warning("Upload a replacement file first.")
                     else:
                         cleanup_service.remove_assets(subject_id, [asset["asset_id"]], remove_vectors=True)
-                        asset_service.add_asset(subject_id, rep_upload.name, rep_upload.getvalue(), rep_upload.type)
+                        asset_service.add_asset(subject_id, rep_upload.name, rep_upload, rep_upload.type)
                         st.success(
                             f"Replaced {asset['original_filename']} with {rep_upload.name}. Run 'Index new uploads' to re-index and regenerate notes as needed."
                         )
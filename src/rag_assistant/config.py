@@ -29,6 +29,7 @@ class QdrantConfig(BaseModel):
     url: str = Field(default="http://localhost:6333")
     collection: str = Field(default="rag_chunks")
     vector_size: int = Field(default=1536)
+    scalar_quantization: bool = Field(default=True)
 
 
 class LoggingConfig(BaseModel):
@@ -80,6 +81,8 @@ class NotesGenerationConfig(BaseModel):
 
 class NotesConfig(BaseModel):
     debug: bool = Field(default=False)
+    fuse_judge_revise: bool = Field(default=False)
+    skip_unchanged_reindex: bool = Field(default=True)
     generation: NotesGenerationConfig = Field(default_factory=NotesGenerationConfig)
 
 
@@ -120,43 +123,46 @@ def _load_yaml(path: Path) -> dict:
         return yaml.safe_load(f) or {}
 
 
+_ENV_OVERRIDES: dict[tuple[str, str], str] = {
+    ("app", "environment"): "APP_ENV",
+    ("app", "data_root"): "DATA_ROOT",
+    ("app", "logs_dir"): "LOGS_DIR",
+    ("database", "sqlite_path"): "DB_PATH",
+    ("logging", "level"): "LOG_LEVEL",
+    ("qdrant", "host"): "QDRANT_HOST",
+    ("qdrant", "port"): "QDRANT_PORT",
+    ("qdrant", "collection_name"): "QDRANT_COLLECTION",
+    ("qdrant", "url"): "QDRANT_URL",
+    ("qdrant", "vector_size"): "QDRANT_VECTOR_SIZE",
+    ("retrieval", "top_k"): "RETRIEVAL_TOP_K",
+    ("llm", "provider"): "LLM_PROVIDER",
+    ("llm", "model"): "LLM_MODEL",
+    ("llm", "base_url"): "LLM_BASE_URL",
+    ("llm", "temperature"): "LLM_TEMPERATURE",
+    ("llm", "timeout_s"): "LLM_TIMEOUT_S",
+    ("embeddings", "provider"): "EMBEDDINGS_PROVIDER",
+    ("embeddings", "model"): "EMBEDDINGS_MODEL",
+    ("embeddings", "vector_size"): "EMBEDDINGS_VECTOR_SIZE",
+    ("ingest", "ocr_engine"): "OCR_ENGINE",
+    ("ingest", "tesseract_cmd"): "TESSERACT_CMD",
+    ("ingest", "tessdata_dir"): "TESSDATA_DIR",
+    ("retrieval", "neighbor_window"): "RETRIEVAL_NEIGHBOR_WINDOW",
+    ("retrieval", "max_neighbor_chunks"): "RETRIEVAL_MAX_NEIGHBOR_CHUNKS",
+    ("retrieval", "min_score"): "RETRIEVAL_MIN_SCORE",
+    ("web", "enabled"): "WEB_ENABLED",
+    ("web", "provider"): "WEB_PROVIDER",
+    ("web", "api_key"): "WEB_API_KEY",
+    ("web", "max_results"): "WEB_MAX_RESULTS",
+    ("web", "timeout_s"): "WEB_TIMEOUT_S",
+    ("web", "min_rag_score_to_skip_web"): "WEB_MIN_RAG_SCORE_TO_SKIP_WEB",
+    ("web", "min_rag_hits_to_skip_web"): "WEB_MIN_RAG_HITS_TO_SKIP_WEB",
+    ("web", "max_web_queries_per_question"): "WEB_MAX_WEB_QUERIES_PER_QUESTION",
+    ("web", "force_even_if_rag_strong"): "WEB_FORCE_EVEN_IF_RAG_STRONG",
+}
+
+
 def _apply_env_overrides(data: dict) -> dict:
-    overrides = {
-        ("app", "environment"): os.getenv("APP_ENV"),
-        ("app", "data_root"): os.getenv("DATA_ROOT"),
-        ("app", "logs_dir"): os.getenv("LOGS_DIR"),
-        ("database", "sqlite_path"): os.getenv("DB_PATH"),
-        ("logging", "level"): os.getenv("LOG_LEVEL"),
-        ("qdrant", "host"): os.getenv("QDRANT_HOST"),
-        ("qdrant", "port"): os.getenv("QDRANT_PORT"),
-        ("qdrant", "collection_name"): os.getenv("QDRANT_COLLECTION"),
-        ("qdrant", "url"): os.getenv("QDRANT_URL"),
-        ("qdrant", "vector_size"): os.getenv("QDRANT_VECTOR_SIZE"),
-        ("retrieval", "top_k"): os.getenv("RETRIEVAL_TOP_K"),
-        ("llm", "provider"): os.getenv("LLM_PROVIDER"),
-        ("llm", "model"): os.getenv("LLM_MODEL"),
-        ("llm", "base_url"): os.getenv("LLM_BASE_URL"),
-        ("llm", "temperature"): os.getenv("LLM_TEMPERATURE"),
-        ("llm", "timeout_s"): os.getenv("LLM_TIMEOUT_S"),
-        ("embeddings", "provider"): os.getenv("EMBEDDINGS_PROVIDER"),
-        ("embeddings", "model"): os.getenv("EMBEDDINGS_MODEL"),
-        ("embeddings", "vector_size"): os.getenv("EMBEDDINGS_VECTOR_SIZE"),
-        ("ingest", "ocr_engine"): os.getenv("OCR_ENGINE"),
-        ("ingest", "tesseract_cmd"): os.getenv("TESSERACT_CMD"),
-        ("ingest", "tessdata_dir"): os.getenv("TESSDATA_DIR"),
-        ("retrieval", "neighbor_window"): os.getenv("RETRIEVAL_NEIGHBOR_WINDOW"),
-        ("retrieval", "max_neighbor_chunks"): os.getenv("RETRIEVAL_MAX_NEIGHBOR_CHUNKS"),
-        ("retrieval", "min_score"): os.getenv("RETRIEVAL_MIN_SCORE"),
-        ("web", "enabled"): os.getenv("WEB_ENABLED"),
-        ("web", "provider"): os.getenv("WEB_PROVIDER"),
-        ("web", "api_key"): os.getenv("WEB_API_KEY"),
-        ("web", "max_results"): os.getenv("WEB_MAX_RESULTS"),
-        ("web", "timeout_s"): os.getenv("WEB_TIMEOUT_S"),
-        ("web", "min_rag_score_to_skip_web"): os.getenv("WEB_MIN_RAG_SCORE_TO_SKIP_WEB"),
-        ("web", "min_rag_hits_to_skip_web"): os.getenv("WEB_MIN_RAG_HITS_TO_SKIP_WEB"),
-        ("web", "max_web_queries_per_question"): os.getenv("WEB_MAX_WEB_QUERIES_PER_QUESTION"),
-        ("web", "force_even_if_rag_strong"): os.getenv("WEB_FORCE_EVEN_IF_RAG_STRONG"),
-    }
+    overrides = {field: os.getenv(env_name) for field, env_name in _ENV_OVERRIDES.items()}
     for (section, key), value in overrides.items():
         if value is None:
             continue
@@ -187,20 +193,53 @@ def _apply_env_overrides(data: dict) -> dict:
     return data
 
 
+_SETTINGS_CACHE: dict[tuple, Settings] = {}
+_SETTINGS_CACHE_SIZE = 8
+
+
+def _load_settings(config_path: Path) -> Settings:
+    """Parse and validate settings once per config file version and env override combination."""
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    key = (str(config_path.resolve()), mtime_ns, tuple(os.getenv(name) for name in _ENV_OVERRIDES.values()))
+    settings = _SETTINGS_CACHE.get(key)
+    if settings is None:
+        raw = _load_yaml(config_path)
+        merged = _apply_env_overrides(raw)
+        settings = Settings(**merged)
+        if len(_SETTINGS_CACHE) >= _SETTINGS_CACHE_SIZE:
+            _SETTINGS_CACHE.clear()
+        _SETTINGS_CACHE[key] = settings
+    # Callers mutate their settings (e.g. per-request overrides), so hand out copies.
+    return settings.model_copy(deep=True)
+
+
+_DOTENV_LOADED = False
+_ENSURED_DIRS: set[str] = set()
+
+
 def load_config(path: Optional[Path] = None) -> Settings:
     """Load configuration from YAML and environment variables."""
-    load_dotenv()
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        # .env is read once per process; load_dotenv never overrides variables that are already set anyway.
+        load_dotenv()
+        _DOTENV_LOADED = True
     config_path = path or DEFAULT_CONFIG_PATH
-    raw = _load_yaml(config_path)
-    merged = _apply_env_overrides(raw)
-    settings = Settings(**merged)
+    settings = _load_settings(config_path)
 
     # Ensure directories exist
     data_root = Path(settings.app.data_root)
     logs_dir = Path(settings.app.logs_dir)
     db_path = Path(settings.database.sqlite_path)
     for directory in [data_root, logs_dir, db_path.parent]:
+        key = str(directory)
+        if key in _ENSURED_DIRS and directory.is_dir():
+            continue
         directory.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(key)
     return settings
 
 
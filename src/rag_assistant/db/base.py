@@ -7,19 +7,55 @@ from pathlib import Path
 
 from rag_assistant.domain.errors import DatabaseError
 
+# Shared-cache in-memory databases vanish when their last connection closes;
+# one anchor connection per URI keeps them alive across get_connection calls.
+_MEMORY_ANCHORS: dict[str, sqlite3.Connection] = {}
+
+
+def is_memory_uri(db_path: Path | str) -> bool:
+    text = str(db_path)
+    return text.startswith("file:") and "mode=memory" in text
+
 
 def get_connection(db_path: Path) -> sqlite3.Connection:
     try:
-        conn = sqlite3.connect(db_path)
+        if is_memory_uri(db_path):
+            uri = str(db_path)
+            if uri not in _MEMORY_ANCHORS:
+                _MEMORY_ANCHORS[uri] = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn = sqlite3.connect(uri, uri=True)
+        else:
+            conn = sqlite3.connect(db_path)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON;")
+        # NORMAL is only crash-safe under WAL; rollback-journal databases keep the FULL default.
+        # fetchall() finishes the statement so it can't pin a WAL read snapshot.
+        (mode,) = conn.execute("PRAGMA journal_mode;").fetchall()[0]
+        if str(mode).lower() == "wal":
+            conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute("PRAGMA temp_store = MEMORY;")
         return conn
     except sqlite3.Error as exc:
         raise DatabaseError(str(exc)) from exc
 
 
+def database_exists(db_path: Path) -> bool:
+    if is_memory_uri(db_path):
+        return str(db_path) in _MEMORY_ANCHORS
+    return Path(db_path).exists()
+
+
+def release_memory_db(db_path: Path | str) -> None:
+    """Close the anchor connection so an in-memory database is freed."""
+    conn = _MEMORY_ANCHORS.pop(str(db_path), None)
+    if conn is not None:
+        conn.close()
+
+
 def ensure_parent_dir(path: Path) -> None:
+    if is_memory_uri(path):
+        return
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
-__all__ = ["get_connection", "ensure_parent_dir"]
+__all__ = ["get_connection", "ensure_parent_dir", "database_exists", "is_memory_uri", "release_memory_db"]
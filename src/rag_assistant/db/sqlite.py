@@ -2,39 +2,159 @@
 
 from __future__ import annotations
 
+import atexit
 import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Iterable
 
-from rag_assistant.db.base import ensure_parent_dir, get_connection
+from rag_assistant.db.base import database_exists, ensure_parent_dir, get_connection, is_memory_uri
 
 SCHEMA_PATH = Path(__file__).resolve().parent / "schema.sql"
 MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
 
 
+_SCHEMA_FINGERPRINT: int | None = None
+
+
+def schema_fingerprint() -> int:
+    """Non-zero 31-bit stamp of schema.sql plus every migration file, computed once per process."""
+    global _SCHEMA_FINGERPRINT
+    if _SCHEMA_FINGERPRINT is None:
+        digest = hashlib.blake2b(SCHEMA_PATH.read_bytes(), digest_size=8)
+        for mig in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            digest.update(mig.name.encode("utf-8"))
+            digest.update(mig.read_bytes())
+        _SCHEMA_FINGERPRINT = (int.from_bytes(digest.digest(), "big") & 0x7FFFFFFF) or 1
+    return _SCHEMA_FINGERPRINT
+
+
+def _schema_is_current(db_path: Path) -> bool:
+    if not database_exists(db_path):
+        return False
+    conn = get_connection(db_path)
+    try:
+        return conn.execute("PRAGMA user_version;").fetchone()[0] == schema_fingerprint()
+    finally:
+        conn.close()
+
+
 def init_db(db_path: Path) -> None:
-    """Initialize the SQLite database using the schema file."""
+    """Initialize the SQLite database using the schema file.
+
+    A database stamped (PRAGMA user_version) with the current schema fingerprint is left
+    alone, so re-initializing a known or copied database costs a single pragma read.
+    """
+    if _schema_is_current(db_path):
+        return
     ensure_parent_dir(db_path)
     with SCHEMA_PATH.open("r", encoding="utf-8") as f:
         schema_sql = f.read()
     with get_connection(db_path) as conn:
+        # Switch to WAL before the DDL so the schema is written without rollback-journal
+        # fsyncs; the mode persists on the database file and later connections inherit it.
+        conn.execute("PRAGMA journal_mode=WAL;")
         conn.executescript(schema_sql)
         conn.commit()
     apply_migrations(db_path)
+    with get_connection(db_path) as conn:
+        conn.execute(f"PRAGMA user_version = {schema_fingerprint()};")
+        conn.commit()
+
+
+# Per-thread connections reused by the helpers below; opening a connection and
+# re-running its pragmas costs more than most of the statements they execute.
+_LOCAL = threading.local()
+_MAX_CACHED_CONNECTIONS = 8
+
+
+def _file_identity(db_path: Path):
+    if is_memory_uri(db_path):
+        return "memory" if database_exists(db_path) else None
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def _cached_connection(db_path: Path) -> sqlite3.Connection:
+    cache = getattr(_LOCAL, "connections", None)
+    if cache is None:
+        cache = _LOCAL.connections = OrderedDict()
+    key = str(db_path)
+    entry = cache.get(key)
+    if entry is not None:
+        conn, identity = entry
+        # Reuse only while the same database file is still in place.
+        if identity is not None and identity == _file_identity(db_path):
+            cache.move_to_end(key)
+            return conn
+        del cache[key]
+        conn.close()
+    conn = get_connection(db_path)
+    cache[key] = (conn, _file_identity(db_path))
+    while len(cache) > _MAX_CACHED_CONNECTIONS:
+        _, (old_conn, _) = cache.popitem(last=False)
+        old_conn.close()
+    return conn
+
+
+def close_cached_connections() -> None:
+    """Close the calling thread's cached helper connections."""
+    cache = getattr(_LOCAL, "connections", None) or {}
+    for conn, _ in cache.values():
+        conn.close()
+    cache.clear()
 
 
 def execute(db_path: Path, sql: str, params: Iterable[Any] | dict[str, Any] = (), *, fetchone: bool = False, fetchall: bool = False):
     """Execute a SQL statement and optionally fetch results."""
-    with get_connection(db_path) as conn:
+    conn = _cached_connection(db_path)
+    result = None
+    try:
         cursor = conn.execute(sql, params)
+        try:
+            # Fetch before committing so INSERT ... RETURNING rows are read inside the transaction.
+            if fetchone:
+                row = cursor.fetchone()
+                result = dict(row) if row else None
+            elif fetchall:
+                result = [dict(r) for r in cursor.fetchall()]
+        finally:
+            # An unfinished statement would keep a read lock on the shared connection.
+            cursor.close()
         conn.commit()
-        if fetchone:
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        if fetchall:
-            rows = cursor.fetchall()
-            return [dict(r) for r in rows]
-    return None
+    except Exception:
+        conn.rollback()
+        raise
+    return result
+
+
+def fetch_column(db_path: Path, sql: str, params: Iterable[Any] | dict[str, Any] = ()) -> list:
+    """Return the first column of every row without building per-row dicts."""
+    cursor = _cached_connection(db_path).cursor()
+    cursor.row_factory = None
+    try:
+        return [row[0] for row in cursor.execute(sql, params)]
+    finally:
+        cursor.close()
+
+
+def execute_many(db_path: Path, sql: str, rows: Iterable[Iterable[Any] | dict[str, Any]]) -> None:
+    """Execute a SQL statement for every row inside a single transaction."""
+    conn = _cached_connection(db_path)
+    try:
+        conn.execute("BEGIN;")
+        conn.executemany(sql, rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 
 def has_column(db_path: Path, table: str, column: str) -> bool:
@@ -141,19 +261,35 @@ def delete_asset(db_path: Path, asset_id: str) -> None:
         conn.commit()
 
 
+# Existence checks are I/O-bound (and slow on network or synced folders), so large
+# subjects stat their stored files from a small shared pool instead of one by one.
+_STAT_POOL: ThreadPoolExecutor | None = None
+_STAT_POOL_MIN_ROWS = 32
+_STAT_POOL_LOCK = threading.Lock()
+
+
+def _stat_pool() -> ThreadPoolExecutor:
+    global _STAT_POOL
+    with _STAT_POOL_LOCK:
+        if _STAT_POOL is None:
+            _STAT_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="asset-stat")
+            atexit.register(_STAT_POOL.shutdown, wait=False)
+    return _STAT_POOL
+
+
 def list_assets_with_missing_files(db_path: Path, subject_id: str) -> list[dict]:
     rows = execute(
         db_path,
         "SELECT asset_id, subject_id, original_filename, stored_path, status FROM assets WHERE subject_id = ?;",
         (subject_id,),
         fetchall=True,
-    )
-    missing = []
-    for row in rows or []:
-        path = Path(row["stored_path"])
-        if not path.exists():
-            missing.append(row)
-    return missing
+    ) or []
+    paths = [row["stored_path"] for row in rows]
+    if len(rows) >= _STAT_POOL_MIN_ROWS:
+        present = _stat_pool().map(os.path.exists, paths)
+    else:
+        present = map(os.path.exists, paths)
+    return [row for row, exists in zip(rows, present) if not exists]
 
 
-__all__ = ["init_db", "SCHEMA_PATH", "execute"]
+__all__ = ["init_db", "SCHEMA_PATH", "execute", "execute_many", "fetch_column", "close_cached_connections"]
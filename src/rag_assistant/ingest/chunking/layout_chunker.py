@@ -64,7 +64,7 @@ def chunk_ocr_blocks(
                 "asset_id": asset_id,
                 "page_num": page_num,
                 "text": chunk_text,
-                "bbox_json": json.dumps(bbox),
+                "bbox_json": json.dumps(bbox, separators=(",", ":")),
                 "start_block": start_block,
                 "end_block": end_block,
             }
@@ -9,6 +9,22 @@ def _default_bbox() -> list:
     return [0, 0, 1, 1]
 
 
+def _bbox_from_points(points: Any) -> list:
+    """Axis-aligned [x0, y0, x1, y1] around a polygon; Paddle quads take an unpacking fast path."""
+    try:
+        if len(points) == 4:
+            (x0, y0), (x1, y1), (x2, y2), (x3, y3) = points
+            return [min(x0, x1, x2, x3), min(y0, y1, y2, y3), max(x0, x1, x2, x3), max(y0, y1, y2, y3)]
+    except (TypeError, ValueError):
+        pass
+    try:
+        xs = [pt[0] for pt in points]
+        ys = [pt[1] for pt in points]
+        return [min(xs), min(ys), max(xs), max(ys)]
+    except Exception:
+        return _default_bbox()
+
+
 def normalize_ocr_result(raw_result: Any, page_num: int) -> Dict[str, Any]:
     blocks: List[Dict[str, Any]] = []
 
@@ -36,7 +52,7 @@ def normalize_ocr_result(raw_result: Any, page_num: int) -> Dict[str, Any]:
         for line in lines:
             text = ""
             conf = 0.0
-            bbox = _default_bbox()
+            bbox = None
             if isinstance(line, (list, tuple)):
                 if len(line) >= 2 and isinstance(line[0], (list, tuple)):
                     bbox_candidate = line[0]
@@ -54,12 +70,7 @@ def normalize_ocr_result(raw_result: Any, page_num: int) -> Dict[str, Any]:
                             conf = 0.0
                     else:
                         text = str(line[1]) if len(line) > 1 else ""
-                    try:
-                        xs = [pt[0] for pt in bbox_candidate]
-                        ys = [pt[1] for pt in bbox_candidate]
-                        bbox = [min(xs), min(ys), max(xs), max(ys)]
-                    except Exception:
-                        bbox = _default_bbox()
+                    bbox = _bbox_from_points(bbox_candidate)
                 elif len(line) >= 2:
                     # (text, conf)
                     text = str(line[0])
@@ -70,7 +81,7 @@ def normalize_ocr_result(raw_result: Any, page_num: int) -> Dict[str, Any]:
             text = text.strip()
             if not text:
                 continue
-            blocks.append({"text": text, "bbox": bbox, "confidence": conf})
+            blocks.append({"text": text, "bbox": bbox or _default_bbox(), "confidence": conf})
         return {"page": page_num, "blocks": blocks, "width": 0, "height": 0}
 
     # Fallback: unknown format
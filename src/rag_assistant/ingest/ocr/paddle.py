@@ -19,10 +19,19 @@ class OCRIncompatibleError(RuntimeError):
     """Raised when PaddleOCR API is incompatible at runtime."""
 
 
+_PADDLE_MODEL_CACHE: dict[tuple, Any] = {}
+
+
 class PaddleOCREngine:
     def __init__(self, lang: str = "en"):
         if PaddleOCR is None:
             raise ImportError("paddleocr is not installed or failed to load")
+        # Model load and predictor setup dominate engine construction; reuse them per process.
+        key = (PaddleOCR, lang)
+        cached = _PADDLE_MODEL_CACHE.get(key)
+        if cached is not None:
+            self.ocr = cached
+            return
         kwargs: dict[str, Any] = {"lang": lang, "use_angle_cls": False}
         try:
             sig = inspect.signature(PaddleOCR.__init__)
@@ -39,6 +48,7 @@ class PaddleOCREngine:
                 raise OCRIncompatibleError(f"PaddleOCR init failed: {exc}") from exc
         except Exception as exc:
             raise OCRIncompatibleError(f"PaddleOCR init failed: {exc}") from exc
+        _PADDLE_MODEL_CACHE[key] = self.ocr
 
     def ocr_page(self, image_path: str, page_num: int) -> Dict[str, Any]:
         try:
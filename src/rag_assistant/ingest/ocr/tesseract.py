@@ -8,9 +8,6 @@ import subprocess
 from pathlib import Path
 from typing import Dict, Optional
 
-import pytesseract
-from PIL import Image
-
 from rag_assistant.config import load_config
 from rag_assistant.ingest.ocr.normalize import normalize_ocr_result
 
@@ -18,6 +15,26 @@ from rag_assistant.ingest.ocr.normalize import normalize_ocr_result
 COMMON_PATHS = ["/opt/homebrew/bin/tesseract", "/usr/local/bin/tesseract"]
 
 
+def _pytesseract():
+    # Imported on first use so config-only callers don't pay for pytesseract.
+    import pytesseract
+
+    globals()["pytesseract"] = pytesseract
+    return pytesseract
+
+
+def __getattr__(name: str):
+    if name == "pytesseract":
+        return _pytesseract()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Resolved tessdata dirs keyed by (configured dir, tesseract cmd, lang); every engine
+# construction otherwise re-stats the same candidate paths.
+_TESSDATA_CACHE: dict[tuple, Path] = {}
+_TESSDATA_CACHE_SIZE = 16
+
+
 def _resolve_tesseract_cmd(config) -> str:
     if config.ingest.tesseract_cmd:
         return config.ingest.tesseract_cmd
@@ -25,7 +42,7 @@ def _resolve_tesseract_cmd(config) -> str:
     if found:
         return found
     for candidate in COMMON_PATHS:
-        if Path(candidate).exists():
+        if os.path.exists(candidate):
             return candidate
     return ""
 
@@ -41,7 +58,7 @@ class TesseractOCREngine:
         cmd = _resolve_tesseract_cmd(self.cfg)
         if not cmd:
             raise RuntimeError("tesseract binary not found. Set ingest.tesseract_cmd or ensure it is on PATH.")
-        pytesseract.pytesseract.tesseract_cmd = cmd
+        _pytesseract().pytesseract.tesseract_cmd = cmd
         self.tessdata_dir = self._resolve_tessdata_dir(cmd, self.lang)
         try:
             subprocess.run([cmd, "--version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=5, env=self._build_env())
@@ -53,7 +70,7 @@ class TesseractOCREngine:
     def ocr_page(self, image_path, page_num: int) -> Dict:
         try:
             env = self._build_env()
-            text = pytesseract.image_to_string(str(image_path), lang=self.lang)
+            text = _pytesseract().image_to_string(str(image_path), lang=self.lang)
         except Exception as exc:
             raise RuntimeError(
                 f"Tesseract OCR failed: {exc}. cmd={self.tesseract_cmd}, tessdata_dir={self.tessdata_dir}, lang={self.lang}. "
@@ -68,17 +85,26 @@ class TesseractOCREngine:
 
     def _resolve_tessdata_dir(self, cmd: str, lang: str) -> Path:
         cfg_dir = self.cfg.ingest.tessdata_dir
+        key = (cfg_dir, cmd, lang)
+        cached = _TESSDATA_CACHE.get(key)
+        if cached is not None:
+            return cached
+        # Candidates are plain strings; only the resolved directory becomes a Path.
         candidates = []
         if cfg_dir:
-            candidates.append(Path(cfg_dir))
-        cmd_path = Path(cmd)
-        if cmd_path.parent.name == "bin":
-            candidates.append(cmd_path.parent.parent / "share" / "tessdata")
-        candidates.extend([Path("/opt/homebrew/share/tessdata"), Path("/usr/local/share/tessdata")])
+            candidates.append(str(cfg_dir))
+        bin_dir = os.path.dirname(cmd)
+        if os.path.basename(bin_dir) == "bin":
+            candidates.append(os.path.join(os.path.dirname(bin_dir), "share", "tessdata"))
+        candidates.extend(["/opt/homebrew/share/tessdata", "/usr/local/share/tessdata"])
+        lang_name = f"{lang}.traineddata"
         for cand in candidates:
-            lang_file = cand / f"{lang}.traineddata"
-            if lang_file.exists():
-                return cand
+            if os.path.exists(os.path.join(cand, lang_name)):
+                resolved = Path(cand)
+                if len(_TESSDATA_CACHE) >= _TESSDATA_CACHE_SIZE:
+                    _TESSDATA_CACHE.clear()
+                _TESSDATA_CACHE[key] = resolved
+                return resolved
         raise RuntimeError(f"tessdata for lang '{lang}' not found in candidates: {candidates}")
 
 
@@ -19,7 +19,7 @@ from rag_assistant.ingest.render.pdf_to_images import render_pdf_to_images
 from rag_assistant.retrieval.embedder import Embedder
 from rag_assistant.retrieval.vector_store.qdrant import QdrantStore
 from rag_assistant.services import asset_service
-from rag_assistant.vectorstore.point_id import make_point_uuid
+from rag_assistant.vectorstore.point_id import make_point_uuids
 
 STAGE_ORDER = ["stored", "rendered", "ocr_done", "chunked", "embedded", "indexed", "missing", "failed"]
 logger = logging.getLogger(__name__)
@@ -175,12 +175,13 @@ def process_asset(subject_id: str, asset: dict, config=None, *, force: bool = Fa
             embedder = Embedder(config=cfg)
             vectors = embedder.embed_texts([c["text"] for c in chunks_all])  # type: ignore[arg-type]
             payloads = []
-            ids = []
+            identities = []
             page_lookup = {p["page_num"]: p for p in pages}
             for chunk, vec in zip(chunks_all, vectors):
                 page_meta = page_lookup.get(chunk["page_num"], {})
-                identity = f"{chunk['subject_id']}:{chunk['asset_id']}:{chunk['page_num']}:{chunk.get('chunk_id', chunk.get('start_block'))}"
-                point_id = make_point_uuid(identity)
+                identities.append(
+                    f"{chunk['subject_id']}:{chunk['asset_id']}:{chunk['page_num']}:{chunk.get('chunk_id', chunk.get('start_block'))}"
+                )
                 payloads.append(
                     {
                         "source_type": "slide",
@@ -194,7 +195,7 @@ def process_asset(subject_id: str, asset: dict, config=None, *, force: bool = Fa
                         "preview": chunk["text"][:240],
                     }
                 )
-                ids.append(point_id)
+            ids = make_point_uuids(identities)
             store = QdrantStore()
             store.upsert_chunks(vectors, payloads, ids)
             _set_stage(asset_id, "embedded")
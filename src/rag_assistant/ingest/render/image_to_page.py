@@ -6,8 +6,6 @@ import shutil
 from pathlib import Path
 from typing import Dict
 
-import cv2
-
 
 def normalize_image_to_page(image_path: str, out_dir: str) -> Dict:
     """Copy a standalone image into the pages directory as page_0001.png."""
@@ -20,6 +18,8 @@ def normalize_image_to_page(image_path: str, out_dir: str) -> Dict:
     target = output_dir / "page_0001.png"
     shutil.copyfile(src, target)
 
+    import cv2  # deferred: OpenCV is only needed once an image asset is ingested
+
     img = cv2.imread(str(target))
     if img is None:
         raise ValueError(f"Could not load image: {image_path}")
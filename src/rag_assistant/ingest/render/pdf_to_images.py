@@ -5,8 +5,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List, Dict
 
-import fitz  # PyMuPDF
-
 
 def render_pdf_to_images(pdf_path: str, out_dir: str, dpi: int) -> List[Dict]:
     """Render PDF pages to PNG images.
@@ -20,6 +18,8 @@ def render_pdf_to_images(pdf_path: str, out_dir: str, dpi: int) -> List[Dict]:
     output_dir = Path(out_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    import fitz  # PyMuPDF; deferred so importing the ingest pipeline stays cheap
+
     doc = fitz.open(pdf_file)
     results: List[Dict] = []
     for page_index in range(len(doc)):
@@ -4,8 +4,8 @@ from __future__ import annotations
 
 import json
 import time
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
 
 import requests
 
@@ -19,20 +19,26 @@ class OllamaClient:
     base_url: str = "http://127.0.0.1:11434"
     model: str = "llama3.1:8b"
     timeout_s: int = 60
+    # Anything with a requests-style post(); defaults to the requests module itself.
+    session: Any = field(default=None, repr=False, compare=False)
 
-    def generate(
+    def _post(self, url: str, **kwargs):
+        return (self.session or requests).post(url, **kwargs)
+
+    def _payload(
         self,
         prompt: str,
+        *,
+        stream: bool,
         temperature: Optional[float] = None,
         top_p: Optional[float] = None,
         seed: Optional[int] = None,
         max_tokens: Optional[int] = None,
-    ) -> str:
-        url = f"{self.base_url.rstrip('/')}/api/generate"
+    ) -> dict:
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
         }
         if temperature is not None:
             payload["temperature"] = temperature
@@ -42,8 +48,22 @@ class OllamaClient:
             payload["seed"] = seed
         if max_tokens is not None:
             payload["num_predict"] = max_tokens
+        return payload
+
+    def generate(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        seed: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        url = f"{self.base_url.rstrip('/')}/api/generate"
+        payload = self._payload(
+            prompt, stream=False, temperature=temperature, top_p=top_p, seed=seed, max_tokens=max_tokens
+        )
         try:
-            resp = requests.post(url, json=payload, timeout=self.timeout_s)
+            resp = self._post(url, json=payload, timeout=self.timeout_s)
         except requests.RequestException as exc:  # pragma: no cover - network path
             raise OllamaError(f"Ollama not reachable at {self.base_url}. Start Ollama with 'ollama serve'. Details: {exc}")
         if resp.status_code != 200:
@@ -57,5 +77,45 @@ class OllamaClient:
             raise OllamaError("Empty response from Ollama.")
         return output
 
+    def generate_stream(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        seed: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Yield response fragments as Ollama produces them."""
+        url = f"{self.base_url.rstrip('/')}/api/generate"
+        payload = self._payload(
+            prompt, stream=True, temperature=temperature, top_p=top_p, seed=seed, max_tokens=max_tokens
+        )
+        try:
+            resp = self._post(url, json=payload, timeout=self.timeout_s, stream=True)
+        except requests.RequestException as exc:  # pragma: no cover - network path
+            raise OllamaError(f"Ollama not reachable at {self.base_url}. Start Ollama with 'ollama serve'. Details: {exc}")
+        # Always release the pooled connection, including when the caller stops iterating early.
+        try:
+            if resp.status_code != 200:
+                raise OllamaError(f"Ollama returned {resp.status_code}: {resp.text}")
+            produced = False
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise OllamaError(f"Invalid JSON from Ollama: {line!r}") from exc
+                fragment = data.get("response") or ""
+                if fragment:
+                    produced = True
+                    yield fragment
+                if data.get("done"):
+                    break
+            if not produced:
+                raise OllamaError("Empty response from Ollama.")
+        finally:
+            resp.close()
+
 
 __all__ = ["OllamaClient", "OllamaError"]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+from typing import Callable, Optional
 
 from rag_assistant.config import load_config
 from rag_assistant.llm.ollama_client import OllamaClient, OllamaError
@@ -16,7 +17,8 @@ except Exception:  # pragma: no cover - optional import
     OpenAIError = Exception  # type: ignore
 
 
-def generate_answer(prompt: str, config=None, **generation_kwargs) -> str:
+def generate_answer(prompt: str, config=None, *, on_token: Optional[Callable[[str], None]] = None, **generation_kwargs) -> str:
+    """Generate a completion; when ``on_token`` is given, stream fragments to it as they arrive."""
     cfg = config or load_config()
     provider = cfg.llm.provider.lower()
     temperature = generation_kwargs.get("temperature", cfg.llm.temperature)
@@ -25,21 +27,39 @@ def generate_answer(prompt: str, config=None, **generation_kwargs) -> str:
     max_tokens = generation_kwargs.get("max_tokens")
     if provider == "ollama":
         client = OllamaClient(base_url=cfg.llm.base_url, model=cfg.llm.model, timeout_s=cfg.llm.timeout_s)
-        return client.generate(prompt, temperature=temperature, top_p=top_p, seed=seed, max_tokens=max_tokens)
+        if on_token is None:
+            return client.generate(prompt, temperature=temperature, top_p=top_p, seed=seed, max_tokens=max_tokens)
+        parts = []
+        for fragment in client.generate_stream(prompt, temperature=temperature, top_p=top_p, seed=seed, max_tokens=max_tokens):
+            parts.append(fragment)
+            on_token(fragment)
+        return "".join(parts)
     if provider == "openai":
         api_key = os.getenv("OPENAI_API_KEY")
         base_url = os.getenv("OPENAI_BASE_URL")
         if not api_key or OpenAI is None:
             return "OPENAI_API_KEY not set; cannot generate answer."
         client = OpenAI(api_key=api_key, base_url=base_url or None)
-        completion = client.chat.completions.create(
-            model=cfg.llm.chat_model,
-            messages=[{"role": "system", "content": "Answer using only provided notes."}, {"role": "user", "content": prompt}],
-            temperature=temperature,
-            top_p=top_p or 1,
-            max_tokens=max_tokens or 400,
-        )
-        return completion.choices[0].message.content or ""
+        request = {
+            "model": cfg.llm.chat_model,
+            "messages": [
+                {"role": "system", "content": "Answer using only provided notes."},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": temperature,
+            "top_p": top_p or 1,
+            "max_tokens": max_tokens or 400,
+        }
+        if on_token is None:
+            completion = client.chat.completions.create(**request)
+            return completion.choices[0].message.content or ""
+        parts = []
+        for event in client.chat.completions.create(stream=True, **request):
+            fragment = (event.choices[0].delta.content or "") if event.choices else ""
+            if fragment:
+                parts.append(fragment)
+                on_token(fragment)
+        return "".join(parts)
     return "LLM provider not supported."
 
 
@@ -3,14 +3,14 @@
 from __future__ import annotations
 
 import os
+import threading
 from typing import List, Optional
 
 from rag_assistant.config import load_config
 
-try:
-    from sentence_transformers import SentenceTransformer
-except Exception:  # pragma: no cover - optional import
-    SentenceTransformer = None  # type: ignore
+# Resolved on first local embed: importing sentence-transformers pulls in torch,
+# which dominates cold start for callers (and tests) that never embed locally.
+SentenceTransformer = None  # type: ignore
 
 try:
     from openai import OpenAI, OpenAIError
@@ -19,14 +19,30 @@ except Exception:  # pragma: no cover - optional import
     OpenAIError = Exception  # type: ignore
 
 _LOCAL_MODEL_CACHE: dict[str, object] = {}
+_LOCAL_MODEL_LOCK = threading.Lock()
 
 
-def _get_local_model(model_name: str):
+def _sentence_transformer_cls():
+    global SentenceTransformer
     if SentenceTransformer is None:
-        raise RuntimeError("sentence-transformers is not installed")
-    if model_name not in _LOCAL_MODEL_CACHE:
-        _LOCAL_MODEL_CACHE[model_name] = SentenceTransformer(model_name)
-    return _LOCAL_MODEL_CACHE[model_name]
+        try:
+            from sentence_transformers import SentenceTransformer as cls
+        except Exception as exc:  # pragma: no cover - optional import
+            raise RuntimeError("sentence-transformers is not installed") from exc
+        SentenceTransformer = cls
+    return SentenceTransformer
+
+
+def _get_local_model(model_name: str):
+    model = _LOCAL_MODEL_CACHE.get(model_name)
+    if model is None:
+        # Concurrent first embeds (e.g. notes prefetch workers) must not load the model twice.
+        with _LOCAL_MODEL_LOCK:
+            model = _LOCAL_MODEL_CACHE.get(model_name)
+            if model is None:
+                model = _sentence_transformer_cls()(model_name)
+                _LOCAL_MODEL_CACHE[model_name] = model
+    return model
 
 
 def get_embedding_dim(config=None) -> int:
@@ -148,10 +148,17 @@ class QdrantStore:
                     f"Use a new collection name or recreate the collection."
                 )
             return
+        quantization = None
+        if getattr(self.cfg.qdrant, "scalar_quantization", False):
+            # int8 copies kept in RAM cut search memory ~4x; originals stay available for rescoring.
+            quantization = qmodels.ScalarQuantization(
+                scalar=qmodels.ScalarQuantizationConfig(type=qmodels.ScalarType.INT8, always_ram=True)
+            )
         try:
             self.client.create_collection(
                 collection_name=self.collection,
                 vectors_config=qmodels.VectorParams(size=self.vector_size, distance=qmodels.Distance.COSINE),
+                quantization_config=quantization,
             )
         except Exception as exc:
             logger.warning("Skipping collection creation; Qdrant not reachable", extra={"error": str(exc)})
@@ -329,6 +336,22 @@ class QdrantStore:
         except Exception:
             pass
 
+    def set_notes_version(self, notes_id: str, version: int) -> None:
+        """Bump the version in payloads of already-indexed notes points without re-uploading vectors."""
+        try:
+            self.client.set_payload(
+                collection_name=self.collection,
+                payload={"version": version},
+                points=qmodels.Filter(
+                    must=[qmodels.FieldCondition(key="notes_id", match=qmodels.MatchValue(value=notes_id))]
+                ),
+            )
+        except Exception as exc:
+            logger.warning(
+                "Failed to bump notes version in Qdrant payloads",
+                extra={"notes_id": notes_id, "version": version, "error": str(exc)},
+            )
+
     def health_check(self) -> None:
         try:
             self.client.get_collections()
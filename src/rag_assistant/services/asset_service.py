@@ -4,22 +4,42 @@ from __future__ import annotations
 
 import hashlib
 import re
+import shutil
+import sqlite3
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, List, Optional
 
 from rag_assistant.config import load_config
+from rag_assistant.db.base import database_exists
 from rag_assistant.db.sqlite import execute, init_db
 from rag_assistant.services.subject_service import ensure_subject_dirs, get_subject
 
 _DB_PATH: Path | None = None
+_COPY_CHUNK = 1 << 20
+# INSERT ... RETURNING needs SQLite 3.35+; older builds keep the lookup-then-insert path.
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_ASSET_COLUMNS = (
+    "asset_id",
+    "subject_id",
+    "original_filename",
+    "stored_path",
+    "sha256",
+    "size_bytes",
+    "mime_type",
+    "created_at",
+    "status",
+    "meta_json",
+)
+_ASSET_COLUMNS_SQL = ", ".join(_ASSET_COLUMNS)
+_ASSET_PLACEHOLDERS = ", ".join("?" * len(_ASSET_COLUMNS))
 
 
 def _db_path() -> Path:
     global _DB_PATH
     cfg = load_config()
     db_path = Path(cfg.database.sqlite_path)
-    if _DB_PATH != db_path or not db_path.exists():
+    if _DB_PATH != db_path or not database_exists(db_path):
         init_db(db_path)
         _DB_PATH = db_path
     return db_path
@@ -52,61 +72,98 @@ def get_asset(asset_id: str) -> Optional[dict]:
     return _get_asset(asset_id)
 
 
-def add_asset(subject_id: str, uploaded_filename: str, file_bytes: bytes, mime_type: str | None) -> dict:
+def _write_asset(path: Path, file_bytes: bytes | BinaryIO) -> None:
+    if isinstance(file_bytes, (bytes, bytearray, memoryview)):
+        path.write_bytes(file_bytes)
+        return
+    file_bytes.seek(0)
+    with path.open("wb") as out:
+        shutil.copyfileobj(file_bytes, out, _COPY_CHUNK)
+
+
+def _restore_existing(existing: dict, file_bytes: bytes | BinaryIO) -> dict:
+    existing_path = Path(existing["stored_path"])
+    if not existing_path.exists():
+        existing_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_asset(existing_path, file_bytes)
+    return existing
+
+
+def add_asset(subject_id: str, uploaded_filename: str, file_bytes: bytes | BinaryIO, mime_type: str | None) -> dict:
     """Store a file for a subject and record metadata.
 
+    ``file_bytes`` may also be a seekable binary file object, which is hashed and
+    copied in chunks instead of being read into memory.
     If an asset with the same content (sha256) already exists, return it.
     """
     subject = get_subject(subject_id)
     if subject is None:
         raise ValueError(f"Subject '{subject_id}' does not exist")
 
-    sha_full = hashlib.sha256(file_bytes).hexdigest()
+    # asset_id must stay the sha256 prefix: it keys dedup and Qdrant point ids for existing
+    # libraries, and with SHA-NI hashlib's sha256 outruns the stdlib alternatives (blake2b ~2x slower).
+    if isinstance(file_bytes, (bytes, bytearray, memoryview)):
+        sha_full = hashlib.sha256(file_bytes).hexdigest()
+        size_bytes = len(file_bytes)
+    else:
+        file_bytes.seek(0)
+        sha_full = hashlib.file_digest(file_bytes, "sha256").hexdigest()
+        # file_digest hashes a BytesIO via its buffer without moving the position.
+        size_bytes = file_bytes.seek(0, 2)
     asset_id = sha_full[:16]
-    existing = _get_asset(asset_id)
-    if existing:
-        existing_path = Path(existing["stored_path"])
-        if not existing_path.exists():
-            existing_path.parent.mkdir(parents=True, exist_ok=True)
-            existing_path.write_bytes(file_bytes)
-        return existing
 
     storage_dir = ensure_subject_dirs(subject_id)
     sanitized_name = _sanitize_filename(uploaded_filename)
     target_path = _resolve_collision_path(storage_dir, sanitized_name)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    target_path.write_bytes(file_bytes)
 
-    created_at = time.time()
-    sql = (
-        "INSERT INTO assets (asset_id, subject_id, original_filename, stored_path, sha256, size_bytes, mime_type, created_at, status, meta_json) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);"
-    )
     params = (
         asset_id,
         subject_id,
         uploaded_filename,
         str(target_path),
         sha_full,
-        len(file_bytes),
+        size_bytes,
         mime_type,
-        created_at,
+        time.time(),
         "stored",
         None,
     )
-    execute(_db_path(), sql, params)
-    return {
-        "asset_id": asset_id,
-        "subject_id": subject_id,
-        "original_filename": uploaded_filename,
-        "stored_path": str(target_path),
-        "sha256": sha_full,
-        "size_bytes": len(file_bytes),
-        "mime_type": mime_type,
-        "created_at": created_at,
-        "status": "stored",
-        "meta_json": None,
-    }
+    if not _SQLITE_HAS_RETURNING:
+        existing = _get_asset(asset_id)
+        if existing:
+            return _restore_existing(existing, file_bytes)
+        _write_asset(target_path, file_bytes)
+        execute(_db_path(), f"INSERT INTO assets ({_ASSET_COLUMNS_SQL}) VALUES ({_ASSET_PLACEHOLDERS});", params)
+        return dict(zip(_ASSET_COLUMNS, params))
+
+    # One round-trip for new content: the insert only lands when asset_id is unseen and
+    # hands back the stored row, so the dedup lookup runs only on conflict. The row is
+    # committed just before its file is written, so a concurrent missing-file scan can
+    # briefly report it as missing.
+    sql = (
+        f"INSERT INTO assets ({_ASSET_COLUMNS_SQL}) VALUES ({_ASSET_PLACEHOLDERS}) "
+        "ON CONFLICT(asset_id) DO NOTHING RETURNING *;"
+    )
+    row = execute(_db_path(), sql, params, fetchone=True)
+    if row is None:
+        existing = _get_asset(asset_id)
+        if existing is not None:
+            return _restore_existing(existing, file_bytes)
+        # The conflicting row was deleted (e.g. by cleanup) between the insert and the
+        # lookup; try the insert once more.
+        row = execute(_db_path(), sql, params, fetchone=True)
+        if row is None:
+            existing = _get_asset(asset_id)
+            if existing is None:
+                raise RuntimeError(f"Asset '{asset_id}' changed concurrently while storing; retry the upload")
+            return _restore_existing(existing, file_bytes)
+
+    try:
+        _write_asset(target_path, file_bytes)
+    except Exception:
+        execute(_db_path(), "DELETE FROM assets WHERE asset_id = ?;", (asset_id,))
+        raise
+    return row
 
 
 def list_assets(subject_id: str) -> List[dict]:
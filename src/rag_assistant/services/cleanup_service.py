@@ -18,13 +18,9 @@ def remove_assets(subject_id: str, asset_ids: List[str], *, remove_vectors: bool
     notes_ids: List[str] = []
     for asset_id in asset_ids:
         # capture notes ids for cleanup
-        rows = db.execute(
-            asset_service.get_db_path(),
-            "SELECT notes_id FROM notes WHERE asset_id = ?;",
-            (asset_id,),
-            fetchall=True,
+        notes_ids.extend(
+            db.fetch_column(asset_service.get_db_path(), "SELECT notes_id FROM notes WHERE asset_id = ?;", (asset_id,))
         )
-        notes_ids.extend([r["notes_id"] for r in rows or []])
         db.delete_asset_dependent_rows(asset_service.get_db_path(), asset_id)
         db.delete_asset(asset_service.get_db_path(), asset_id)
         deleted.append(asset_id)
@@ -242,10 +242,9 @@ def render_notes_markdown_to_pdf(markdown_text: str, title: str | None = None) -
         else:
             add_paragraph(str(data), size=11, font="helv", leading=14)
 
-    buf = io.BytesIO()
-    doc.save(buf)
-    buf.seek(0)
-    return buf.read()
+    data = doc.tobytes()
+    doc.close()
+    return data
 
 
 __all__ = ["render_notes_markdown_to_pdf"]
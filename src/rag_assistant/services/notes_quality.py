@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from typing import Optional
 
@@ -53,17 +54,54 @@ Instructions:
     )
 
 
-def judge_notes(draft_md: str, config, trace: Optional[list] = None, round_num: int = 1) -> dict:
-    _trace = trace.append if trace is not None else lambda *a, **k: None
-    _trace(f"[NOTES] judge_review:start round={round_num}")
-    cfg = config
+def _judge_and_revise_prompt() -> Template:
+    return Template(
+        """
+You are reviewing draft study notes for quality, completeness, and structure, and revising them in the same step.
+
+Draft notes:
+{{draft}}
+
+Instructions:
+- List key missing points or weak spots in bullet form as the critique.
+- If the draft is already clear and complete, set needs_revision to false and leave revised_markdown empty.
+- Otherwise revise the notes: keep Markdown headings/bullets concise, add missing key points based on the draft context (do not invent new topics), organize sections, and fix formatting.
+- Respond with a single JSON object and nothing else:
+  {"critique": "<bullets>", "needs_revision": true, "revised_markdown": "<revised notes>"}
+"""
+    )
+
+
+def _generation_params(cfg) -> dict:
     gen_cfg = getattr(getattr(cfg, "notes", None), "generation", None) if cfg else None
-    params = {
+    return {
         "temperature": getattr(gen_cfg, "temperature", None),
         "top_p": getattr(gen_cfg, "top_p", None),
         "seed": getattr(gen_cfg, "seed", None),
         "max_tokens": getattr(gen_cfg, "max_tokens", None),
     }
+
+
+def _parse_fused_response(text: str) -> Optional[dict]:
+    """Extract the JSON object from a fused judge/revise reply; None when it is unusable."""
+    start = (text or "").find("{")
+    end = (text or "").rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(text[start : end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or "needs_revision" not in data:
+        return None
+    return data
+
+
+def judge_notes(draft_md: str, config, trace: Optional[list] = None, round_num: int = 1) -> dict:
+    _trace = trace.append if trace is not None else lambda *a, **k: None
+    _trace(f"[NOTES] judge_review:start round={round_num}")
+    cfg = config
+    params = _generation_params(cfg)
     llm_cfg = getattr(cfg, "llm", None) if cfg else None
     provider = getattr(llm_cfg, "provider", "") if llm_cfg is not None else ""
     if params.get("seed") is not None and provider.lower() != "ollama":
@@ -77,21 +115,42 @@ def judge_notes(draft_md: str, config, trace: Optional[list] = None, round_num:
     return {"needs_revision": needs_revision, "critique": critique_text}
 
 
+def _truthy_flag(value) -> bool:
+    # Models often quote booleans ("false"), and bool("false") is True.
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in {"true", "yes", "1"}
+
+
+def judge_and_revise(draft_md: str, config, trace: Optional[list] = None, round_num: int = 1) -> Optional[dict]:
+    """Judge and revise in one LLM call; returns None if the reply is not the expected JSON."""
+    _trace = trace.append if trace is not None else lambda *a, **k: None
+    _trace(f"[NOTES] judge_review:start round={round_num} fused=true")
+    cfg = config
+    reply = generate_answer(_judge_and_revise_prompt().render(draft=draft_md), cfg, **_generation_params(cfg))
+    parsed = _parse_fused_response(reply)
+    if parsed is None:
+        _trace(f"[NOTES] judge_review:unparsed round={round_num} fused=true")
+        return None
+    critique_text = str(parsed.get("critique") or "")
+    revised = str(parsed.get("revised_markdown") or "")
+    needs_revision = _truthy_flag(parsed.get("needs_revision")) and bool(revised.strip())
+    _trace(
+        f"[NOTES] judge_review:done round={round_num} items={'na' if not critique_text else len(critique_text.splitlines())} needs_revision={needs_revision} fused=true"
+    )
+    if needs_revision:
+        _trace(f"[NOTES] revise:done round={round_num} fused=true")
+    return {"needs_revision": needs_revision, "critique": critique_text, "revised_markdown": revised}
+
+
 def run_quality_loop(draft_md: str, config, trace=None) -> str:
     """Run a single critique + revision pass."""
     _trace = trace.append if trace is not None else lambda *a, **k: None
     cfg = config
     gen_cfg = getattr(getattr(cfg, "notes", None), "generation", None) if cfg else None
-    params = {
-        "temperature": getattr(gen_cfg, "temperature", None),
-        "top_p": getattr(gen_cfg, "top_p", None),
-        "seed": getattr(gen_cfg, "seed", None),
-        "max_tokens": getattr(gen_cfg, "max_tokens", None),
-    }
+    params = _generation_params(cfg)
     min_chars = getattr(gen_cfg, "min_chars", None) or 0
-
-    # Round 1 judge
-    judge_result = judge_notes(draft_md, cfg, trace=trace, round_num=1)
+    fuse = bool(getattr(getattr(cfg, "notes", None), "fuse_judge_revise", False)) if cfg else False
     current = draft_md
 
     def _revise(text: str, critique_text: str, round_num: int, expand_for_length: bool = False) -> str:
@@ -109,13 +168,18 @@ def run_quality_loop(draft_md: str, config, trace=None) -> str:
         _trace(f"[NOTES] revise:done {tag}")
         return revised
 
-    if judge_result.get("needs_revision", True):
-        current = _revise(current, judge_result.get("critique", ""), round_num=1)
+    def _review(text: str, round_num: int, default_needs_revision: bool) -> str:
+        if fuse:
+            fused = judge_and_revise(text, cfg, trace=trace, round_num=round_num)
+            if fused is not None:
+                return fused["revised_markdown"] if fused["needs_revision"] else text
+        judge_result = judge_notes(text, cfg, trace=trace, round_num=round_num)
+        if judge_result.get("needs_revision", default_needs_revision):
+            return _revise(text, judge_result.get("critique", ""), round_num=round_num)
+        return text
 
-    # Round 2 judge
-    judge_result2 = judge_notes(current, cfg, trace=trace, round_num=2)
-    if judge_result2.get("needs_revision", False):
-        current = _revise(current, judge_result2.get("critique", ""), round_num=2)
+    current = _review(current, round_num=1, default_needs_revision=True)
+    current = _review(current, round_num=2, default_needs_revision=False)
 
     # Optional expansion only if min_chars > 0 and still short
     if min_chars > 0 and len(current or "") < min_chars:
@@ -124,4 +188,4 @@ def run_quality_loop(draft_md: str, config, trace=None) -> str:
     return current
 
 
-__all__ = ["run_quality_loop", "judge_notes"]
+__all__ = ["run_quality_loop", "judge_notes", "judge_and_revise"]
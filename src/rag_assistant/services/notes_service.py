@@ -2,29 +2,46 @@
 
 from __future__ import annotations
 
+import atexit
 import hashlib
 import json
 import logging
+import threading
 import time
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Tuple
 
 from jinja2 import Template
 
 from rag_assistant.config import load_config
-from rag_assistant.db.sqlite import execute
+from rag_assistant.db.sqlite import execute, execute_many, fetch_column
 from rag_assistant.llm.provider import generate_answer
 from rag_assistant.rag import judge
 from rag_assistant.retrieval.embedder import Embedder
 from rag_assistant.retrieval.vector_store.qdrant import QdrantStore
 from rag_assistant.services import asset_service
 from rag_assistant.services.notes_quality import run_quality_loop
-from rag_assistant.vectorstore.point_id import make_point_uuid
+from rag_assistant.vectorstore.point_id import make_point_uuids
 from rag_assistant.web import search_client
 
 
 logger = logging.getLogger("rag_assistant.notes")
 
+# Single-slot caches keyed on the factory and the settings it reads, so a
+# process reuses one embedder / Qdrant client across notes operations.
+_EMBEDDER_CACHE: dict[tuple, object] = {}
+_STORE_CACHE: dict[tuple, object] = {}
+# Prefetch workers can hit an empty cache together; the locks keep the fill to one build.
+_EMBEDDER_LOCK = threading.Lock()
+_STORE_LOCK = threading.Lock()
+
+# Background embedding work from every notes request shares this pool, which
+# bounds how many embedding calls run at once across concurrent sessions.
+_EMBED_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notes-embed")
+atexit.register(_EMBED_POOL.shutdown, wait=False)
+
 
 def _log(cfg, message: str) -> None:
     notes_cfg = getattr(cfg, "notes", None)
@@ -37,6 +54,32 @@ def _trace(trace: Optional[list], message: str) -> None:
         trace.append(message)
 
 
+def _get_embedder(cfg):
+    key = (Embedder, cfg.embeddings.provider, cfg.embeddings.model, cfg.llm.embed_model)
+    embedder = _EMBEDDER_CACHE.get(key)
+    if embedder is None:
+        with _EMBEDDER_LOCK:
+            embedder = _EMBEDDER_CACHE.get(key)
+            if embedder is None:
+                _EMBEDDER_CACHE.clear()
+                embedder = Embedder(config=cfg)
+                _EMBEDDER_CACHE[key] = embedder
+    return embedder
+
+
+def _get_store(cfg):
+    key = (QdrantStore, cfg.qdrant.url, cfg.qdrant.collection, cfg.database.sqlite_path)
+    store = _STORE_CACHE.get(key)
+    if store is None:
+        with _STORE_LOCK:
+            store = _STORE_CACHE.get(key)
+            if store is None:
+                _STORE_CACHE.clear()
+                store = QdrantStore()
+                _STORE_CACHE[key] = store
+    return store
+
+
 def _notes_generation_params(cfg) -> dict:
     notes_cfg = getattr(cfg, "notes", None)
     gen_cfg = getattr(notes_cfg, "generation", None) if notes_cfg else None
@@ -118,17 +161,21 @@ def _chunk_markdown(markdown: str, notes_id: str, max_chars: int) -> List[dict]:
     sections: List[Tuple[str, List[str]]] = []
     current_title = "Overview"
     buffer: List[str] = []
+    buffer_chars = 0  # running total; re-summing the buffer per line is quadratic in section length
     for line in markdown.splitlines():
-        if line.strip().startswith("#"):
+        if line.lstrip().startswith("#"):
             if buffer:
                 sections.append((current_title, buffer))
                 buffer = []
+                buffer_chars = 0
             current_title = line.lstrip("#").strip() or "Section"
             continue
         buffer.append(line)
-        if sum(len(l) for l in buffer) >= max_chars:
+        buffer_chars += len(line)
+        if buffer_chars >= max_chars:
             sections.append((current_title, buffer))
             buffer = []
+            buffer_chars = 0
     if buffer:
         sections.append((current_title, buffer))
 
@@ -154,6 +201,23 @@ def _chunk_markdown(markdown: str, notes_id: str, max_chars: int) -> List[dict]:
     return chunks
 
 
+def _normalize_chunk_text(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def _resolve_chunk_labels(chunks: List[dict], label_pool: dict[str, deque[str]]) -> List[str]:
+    """Give each chunk the provenance label of an identical previous chunk, else mark it user-authored.
+
+    Matching is a hash lookup on whitespace-normalized text, so it stays linear in
+    the number of chunks; repeated texts consume their previous labels in order.
+    """
+    resolved: List[str] = []
+    for ch in chunks:
+        labels = label_pool.get(_normalize_chunk_text(ch["text"]))
+        resolved.append(labels.popleft() if labels else "From User Notes")
+    return resolved
+
+
 def _store_notes(notes_id: str, subject_id: str, asset_id: str, markdown: str, version: int, generated_by: str, meta: dict | None) -> None:
     now = time.time()
     execute(
@@ -172,11 +236,38 @@ def _store_notes(notes_id: str, subject_id: str, asset_id: str, markdown: str, v
             notes_id,
             now,
             now,
-            json.dumps(meta or {}),
+            json.dumps(meta or {}, separators=(",", ":"), ensure_ascii=False),
         ),
     )
 
 
+def _content_hash(markdown: str, cfg) -> str:
+    """Hash the markdown together with where and how it was embedded.
+
+    A new embedding provider/model or Qdrant collection changes the hash, so unchanged
+    notes are still indexed into the new vector space.
+    """
+    emb_cfg = getattr(cfg, "embeddings", None)
+    target = "\0".join(
+        str(part)
+        for part in (
+            getattr(emb_cfg, "provider", ""),
+            getattr(emb_cfg, "model", ""),
+            getattr(getattr(cfg, "qdrant", None), "collection", ""),
+        )
+    )
+    return hashlib.blake2b(f"{target}\0{markdown}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _mark_indexed(notes_id: str, markdown: str, cfg) -> None:
+    """Record the hash of the markdown whose vectors are now in Qdrant."""
+    execute(
+        asset_service.get_db_path(),
+        "UPDATE notes SET meta_json = json_set(COALESCE(meta_json, '{}'), '$.indexed_hash', ?) WHERE notes_id = ?;",
+        (_content_hash(markdown, cfg), notes_id),
+    )
+
+
 def _rebuild_chunks(
     notes_id: str,
     subject_id: str,
@@ -186,28 +277,93 @@ def _rebuild_chunks(
     version: int,
     *,
     chunk_labels: List[str] | None = None,
+    chunks: List[dict] | None = None,
 ) -> List[dict]:
     execute(asset_service.get_db_path(), "DELETE FROM notes_chunks WHERE notes_id = ?;", (notes_id,))
-    chunks = _chunk_markdown(markdown, notes_id, chunk_char_limit)
+    if chunks is None:
+        chunks = _chunk_markdown(markdown, notes_id, chunk_char_limit)
     now = time.time()
     labels_iter = iter(chunk_labels or [])
+    rows = []
     for ch in chunks:
         ch["version"] = version
         try:
             ch["source_label"] = next(labels_iter)
         except StopIteration:
             pass
-        execute(
-            asset_service.get_db_path(),
-            """
-            INSERT OR REPLACE INTO notes_chunks (notes_chunk_id, notes_id, subject_id, asset_id, section_title, text, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?);
-            """,
-            (ch["notes_chunk_id"], notes_id, subject_id, asset_id, ch.get("section_title"), ch["text"], now),
-        )
+        rows.append((ch["notes_chunk_id"], notes_id, subject_id, asset_id, ch.get("section_title"), ch["text"], now))
+    execute_many(
+        asset_service.get_db_path(),
+        """
+        INSERT OR REPLACE INTO notes_chunks (notes_chunk_id, notes_id, subject_id, asset_id, section_title, text, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?);
+        """,
+        rows,
+    )
     return chunks
 
 
+def _embed_chunk_texts(texts: List[str], cfg, precomputed: dict[str, list[float]] | None = None) -> List[List[float]]:
+    """Embed each distinct text once, reusing vectors already computed for identical text."""
+    known = precomputed or {}
+    missing = [t for t in dict.fromkeys(texts) if t not in known]
+    fresh = dict(zip(missing, _get_embedder(cfg).embed_texts(missing))) if missing else {}
+    return [known[t] if t in known else fresh[t] for t in texts]
+
+
+def _embed_quietly(texts: List[str], cfg) -> dict[str, list[float]]:
+    try:
+        return dict(zip(texts, _get_embedder(cfg).embed_texts(texts)))
+    except Exception as exc:  # the final embedding pass reports real failures
+        _log(cfg, f"[NOTES] draft embedding prefetch failed: {exc}")
+        return {}
+
+
+class _DraftPrefetcher:
+    """Embed draft sections in the background as soon as each one is complete.
+
+    A section is complete once the next heading starts, so streamed tokens are
+    scanned for a new heading line and everything before it is submitted.
+    """
+
+    def __init__(self, pool: ThreadPoolExecutor, chunk_limit: int, cfg):
+        self._pool = pool
+        self._chunk_limit = chunk_limit
+        self._cfg = cfg
+        self._text = ""
+        self._flushed = 0
+        self._submitted: set[str] = set()
+        self._futures = []
+
+    def feed(self, fragment: str) -> None:
+        scan_from = max(self._flushed, len(self._text) - 1)
+        self._text += fragment
+        if "#" not in fragment:
+            return
+        boundary = self._text.rfind("\n#", scan_from)
+        if boundary > self._flushed:
+            self._submit(self._text[:boundary])
+            self._flushed = boundary
+
+    def finish(self, markdown: str) -> None:
+        self._submit(markdown)
+
+    def _submit(self, markdown: str) -> None:
+        texts = []
+        for chunk in _chunk_markdown(markdown, "draft", self._chunk_limit):
+            if chunk["text"] not in self._submitted:
+                self._submitted.add(chunk["text"])
+                texts.append(chunk["text"])
+        if texts:
+            self._futures.append(self._pool.submit(_embed_quietly, texts, self._cfg))
+
+    def vectors(self) -> dict[str, list[float]]:
+        merged: dict[str, list[float]] = {}
+        for future in self._futures:
+            merged.update(future.result())
+        return merged
+
+
 def _embed_and_upsert_notes(
     chunks: List[dict],
     subject_id: str,
@@ -217,18 +373,17 @@ def _embed_and_upsert_notes(
     version: int,
     cfg,
     trace: Optional[list] = None,
+    precomputed: dict[str, list[float]] | None = None,
 ) -> int:
     _log(cfg, f"[NOTES] embedding chunks n={len(chunks)}")
     _trace(trace, f"[NOTES] index:embed:start chunks={len(chunks)}")
-    embedder = Embedder(config=cfg)
-    vectors = embedder.embed_texts([c["text"] for c in chunks])
+    vectors = _embed_chunk_texts([c["text"] for c in chunks], cfg, precomputed=precomputed)
     dim = len(vectors[0]) if vectors else 0
     _log(cfg, f"[NOTES] embedding complete dim={dim}")
     _trace(trace, f"[NOTES] index:embed:done dim={dim}")
-    store = QdrantStore()
+    store = _get_store(cfg)
     store.delete_by_notes_id(notes_id)
     payloads = []
-    ids = []
     for chunk, vec in zip(chunks, vectors):
         label = chunk.get("source_label") or ("From User Notes" if generated_by == "user" else "Generated Notes")
         payloads.append(
@@ -247,13 +402,23 @@ def _embed_and_upsert_notes(
                 "preview": chunk["text"][:240],
             }
         )
-        ids.append(make_point_uuid(f"notes:{chunk['notes_chunk_id']}"))
+    ids = make_point_uuids(f"notes:{chunk['notes_chunk_id']}" for chunk in chunks[: len(payloads)])
     store.upsert_chunks(vectors, payloads, ids)
     _log(cfg, f"[NOTES] qdrant upsert notes_id={notes_id} version={version} points={len(ids)}")
     _trace(trace, f"[NOTES] index:qdrant_upsert chunks={len(ids)} notes_id={notes_id} version={version}")
     return len(chunks)
 
 
+def _can_skip_reindex(existing: dict | None, markdown: str, cfg) -> bool:
+    """True when the latest notes were LLM-generated from identical markdown and are already indexed."""
+    if not existing or not getattr(getattr(cfg, "notes", None), "skip_unchanged_reindex", False):
+        return False
+    if existing.get("generated_by") != "llm":
+        return False
+    meta = json.loads(existing.get("meta_json") or "{}")
+    return meta.get("indexed_hash") == _content_hash(markdown, cfg)
+
+
 def _maybe_search_web(question: str, rag_hits: List[dict], cfg, trace: Optional[list] = None):
     web_cfg = getattr(cfg, "web", None)
     if not web_cfg or not getattr(web_cfg, "enabled", False):
@@ -354,11 +519,18 @@ def generate_notes_for_asset(subject_id: str, asset_id: str, config=None, trace:
     if gen_params.get("seed") is not None and getattr(cfg.llm, "provider", "").lower() != "ollama":
         _trace(trace, f"[NOTES] warn seed_not_supported provider={getattr(cfg.llm, 'provider', 'unknown')}")
     _log(cfg, "[NOTES] LLM generating initial notes")
+    chunk_limit = min(getattr(cfg.ingest, "max_chunk_chars", 800), 1200)
+    # Sections the quality loop leaves untouched keep the draft's vectors, so
+    # embed draft sections while the draft streams and the judge/revise LLM
+    # calls are in flight.
+    prefetcher = _DraftPrefetcher(_EMBED_POOL, chunk_limit, cfg)
     _trace(trace, "[NOTES] draft_generate:start")
-    draft_md = generate_answer(prompt, cfg, **gen_params)
+    draft_md = generate_answer(prompt, cfg, on_token=prefetcher.feed, **gen_params)
     _trace(trace, f"[NOTES] draft_generate:done chars={len(draft_md)}")
+    prefetcher.finish(draft_md)
     _log(cfg, "[NOTES] reviser improving notes")
     markdown = run_quality_loop(draft_md, cfg, trace=trace)
+    precomputed = prefetcher.vectors()
 
     notes_id = existing["notes_id"] if existing else uuid.uuid4().hex
     version = int(existing["version"]) + 1 if existing else 1
@@ -368,9 +540,12 @@ def generate_notes_for_asset(subject_id: str, asset_id: str, config=None, trace:
         "queries_attempted": web["queries_attempted"],
         "web_error": web["error"],
     }
-    _store_notes(notes_id, subject_id, asset_id, markdown, version=version, generated_by="llm", meta=meta)
-    chunk_limit = min(getattr(cfg.ingest, "max_chunk_chars", 800), 1200)
     default_label = "Generated Notes"
+    skip_reindex = _can_skip_reindex(existing, markdown, cfg)
+    if skip_reindex:
+        meta["indexed_hash"] = _content_hash(markdown, cfg)
+    _store_notes(notes_id, subject_id, asset_id, markdown, version=version, generated_by="llm", meta=meta)
+    new_chunks = _chunk_markdown(markdown, notes_id, chunk_limit)
     note_chunks = _rebuild_chunks(
         notes_id,
         subject_id,
@@ -378,13 +553,29 @@ def generate_notes_for_asset(subject_id: str, asset_id: str, config=None, trace:
         markdown,
         chunk_limit,
         version,
-        chunk_labels=[default_label] * len(_chunk_markdown(markdown, notes_id, chunk_limit)),
+        chunk_labels=[default_label] * len(new_chunks),
+        chunks=new_chunks,
     )
     _log(cfg, f"[NOTES] chunking notes chunks={len(note_chunks)}")
     _trace(trace, f"[NOTES] chunking notes chunks={len(note_chunks)}")
-    chunk_count = _embed_and_upsert_notes(
-        note_chunks, subject_id, asset_id, notes_id, generated_by="llm", version=version, cfg=cfg, trace=trace
-    )
+    if skip_reindex:
+        # Same LLM markdown is already embedded; only the payload version moves forward.
+        _get_store(cfg).set_notes_version(notes_id, version)
+        chunk_count = len(note_chunks)
+        _trace(trace, f"[NOTES] index:skip_unchanged notes_id={notes_id} version={version}")
+    else:
+        chunk_count = _embed_and_upsert_notes(
+            note_chunks,
+            subject_id,
+            asset_id,
+            notes_id,
+            generated_by="llm",
+            version=version,
+            cfg=cfg,
+            trace=trace,
+            precomputed=precomputed,
+        )
+        _mark_indexed(notes_id, markdown, cfg)
     meta["chunk_labels"] = [{"text": ch["text"], "label": ch.get("source_label", default_label)} for ch in note_chunks]
     _trace(trace, f"[NOTES] persist:notes_saved notes_id={notes_id} version={version}")
     _trace(
@@ -431,50 +622,38 @@ def update_notes(notes_id: str, new_markdown: str, edited_by: str = "user", conf
     generated_by = "user" if edited_by == "user" else "llm"
     meta_json = current.get("meta_json")
     meta = json.loads(meta_json) if meta_json else {}
+    meta.pop("indexed_hash", None)
 
-    prev_rows = execute(asset_service.get_db_path(), "SELECT text FROM notes_chunks WHERE notes_id = ?;", (notes_id,), fetchall=True) or []
-    prev_chunks_texts = [r.get("text", "") for r in prev_rows]
     prev_labels = meta.get("chunk_labels") or []
-
-    def _normalize(text: str) -> str:
-        return " ".join((text or "").split())
-
-    label_pool: dict[str, list[str]] = {}
+    label_pool: dict[str, deque[str]] = {}
     if prev_labels:
         for entry in prev_labels:
-            norm = _normalize(entry.get("text", ""))
-            label_pool.setdefault(norm, []).append(entry.get("label") or "Generated Notes")
+            norm = _normalize_chunk_text(entry.get("text", ""))
+            label_pool.setdefault(norm, deque()).append(entry.get("label") or "Generated Notes")
     else:
+        prev_texts = fetch_column(asset_service.get_db_path(), "SELECT text FROM notes_chunks WHERE notes_id = ?;", (notes_id,))
         default_prev_label = "From User Notes" if current.get("generated_by") == "user" else "Generated Notes"
-        for txt in prev_chunks_texts:
-            norm = _normalize(txt)
-            label_pool.setdefault(norm, []).append(default_prev_label)
+        for text in prev_texts:
+            norm = _normalize_chunk_text(text)
+            label_pool.setdefault(norm, deque()).append(default_prev_label)
 
     chunk_limit = min(getattr(cfg.ingest, "max_chunk_chars", 800), 1200)
-    # generate chunks first to know length for labels
-    temp_chunks = _chunk_markdown(new_markdown, notes_id, chunk_limit)
-    resolved_labels: list[str] = []
-    for ch in temp_chunks:
-        norm = _normalize(ch["text"])
-        labels = label_pool.get(norm) or []
-        if labels:
-            resolved_labels.append(labels.pop(0))
-        else:
-            resolved_labels.append("From User Notes")
-    meta["chunk_labels"] = [{"text": ch["text"], "label": lbl} for ch, lbl in zip(temp_chunks, resolved_labels)]
+    new_chunks = _chunk_markdown(new_markdown, notes_id, chunk_limit)
+    resolved_labels = _resolve_chunk_labels(new_chunks, label_pool)
+    meta["chunk_labels"] = [{"text": ch["text"], "label": lbl} for ch, lbl in zip(new_chunks, resolved_labels)]
 
     _store_notes(notes_id, subject_id, asset_id, new_markdown, version=version, generated_by=generated_by, meta=meta)
     _trace(trace, f"[NOTES] persist:notes_saved notes_id={notes_id} version={version}")
 
-    chunk_limit = min(getattr(cfg.ingest, "max_chunk_chars", 800), 1200)
     note_chunks = _rebuild_chunks(
-        notes_id, subject_id, asset_id, new_markdown, chunk_limit, version, chunk_labels=resolved_labels
+        notes_id, subject_id, asset_id, new_markdown, chunk_limit, version, chunk_labels=resolved_labels, chunks=new_chunks
     )
     _log(cfg, f"[NOTES] chunking notes chunks={len(note_chunks)}")
     _trace(trace, f"[NOTES] chunking notes chunks={len(note_chunks)}")
     chunk_count = _embed_and_upsert_notes(
         note_chunks, subject_id, asset_id, notes_id, generated_by=generated_by, version=version, cfg=cfg, trace=trace
     )
+    _mark_indexed(notes_id, new_markdown, cfg)
     return {"notes_id": notes_id, "version": version, "chunk_count": chunk_count}
 
 
@@ -502,6 +681,7 @@ def save_user_notes(subject_id: str, asset_id: str, markdown: str, config=None)
     chunk_count = _embed_and_upsert_notes(
         note_chunks, subject_id, asset_id, notes_id, generated_by="user", version=version, cfg=cfg, trace=trace
     )
+    _mark_indexed(notes_id, markdown, cfg)
     return {"notes_id": notes_id, "version": version, "chunk_count": chunk_count}
 
 
@@ -531,6 +711,7 @@ def reindex_notes(notes_id: str, config=None) -> dict:
         cfg=cfg,
         trace=trace,
     )
+    _mark_indexed(notes_id, markdown, cfg)
     return {"notes_id": notes_id, "version": version, "chunk_count": chunk_count}
 
 
@@ -5,10 +5,12 @@ from __future__ import annotations
 import hashlib
 import re
 import time
+import unicodedata
 from pathlib import Path
 from typing import List, Optional
 
 from rag_assistant.config import load_config
+from rag_assistant.db.base import database_exists
 from rag_assistant.db.sqlite import execute, init_db
 
 _DB_PATH: Path | None = None
@@ -18,7 +20,7 @@ def _db_path() -> Path:
     global _DB_PATH
     cfg = load_config()
     db_path = Path(cfg.database.sqlite_path)
-    if _DB_PATH != db_path or not db_path.exists():
+    if _DB_PATH != db_path or not database_exists(db_path):
         init_db(db_path)
         _DB_PATH = db_path
     return db_path
@@ -30,6 +32,13 @@ def _slugify(name: str) -> str:
     return slug or "subject"
 
 
+def _name_key(name: str) -> str:
+    # Unlike _slugify this keeps non-ASCII letters and symbols, so "物理"/"数学" and "C++"/"C#"
+    # stay distinct; only case and separator punctuation are folded.
+    folded = unicodedata.normalize("NFKC", name).casefold()
+    return re.sub(r"[\s,.;:_/|\-]+", " ", folded).strip()
+
+
 def _generate_subject_id(name: str, existing_ids: set[str]) -> str:
     base = _slugify(name)
     if base not in existing_ids:
@@ -66,6 +75,14 @@ def create_subject(name: str) -> dict:
         raise ValueError("Subject name is required")
 
     existing = list_subjects()
+    # Names differing only in case, spacing or separators ("ML Fall 2025" / "ml, fall 2025")
+    # reuse that subject instead of creating a near-duplicate.
+    key = _name_key(name)
+    if key:
+        for row in existing:
+            if _name_key(row["name"]) == key:
+                ensure_subject_dirs(row["subject_id"])
+                return row
     existing_ids = {row["subject_id"] for row in existing}
     subject_id = _generate_subject_id(name, existing_ids)
     created_at = time.time()
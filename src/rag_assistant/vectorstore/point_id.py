@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import hashlib
 import uuid
+from typing import Iterable, List
 
 _NAMESPACE = uuid.UUID("12345678-1234-5678-1234-567812345678")
 
@@ -11,4 +13,15 @@ def make_point_uuid(identity: str) -> str:
     return str(uuid.uuid5(_NAMESPACE, identity))
 
 
-__all__ = ["make_point_uuid"]
+def make_point_uuids(identities: Iterable[str]) -> List[str]:
+    """Batch form of make_point_uuid; hashes the namespace prefix once and reuses it per identity."""
+    prefix = hashlib.sha1(_NAMESPACE.bytes)
+    ids = []
+    for identity in identities:
+        digest = prefix.copy()
+        digest.update(identity.encode("utf-8"))
+        ids.append(str(uuid.UUID(bytes=digest.digest()[:16], version=5)))
+    return ids
+
+
+__all__ = ["make_point_uuid", "make_point_uuids"]
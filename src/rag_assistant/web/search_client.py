@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import json
 import os
 import socket
 from dataclasses import dataclass
-from typing import List, Optional
-
-import requests
+from typing import TYPE_CHECKING, Any, List, Optional
 from urllib.parse import urlparse
 
 from rag_assistant.config import load_config
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
 
 @dataclass
 class WebResult:
@@ -26,6 +33,52 @@ class WebSearchError(RuntimeError):
     """Raised when web search fails."""
 
 
+_SESSION: Optional[requests.Session] = None
+_POOL_CONNECTIONS = 8
+_POOL_MAXSIZE = 16
+
+
+def _get_requests():
+    # Imported on first use so importing this module for its filters stays cheap.
+    import requests
+
+    globals()["requests"] = requests
+    return requests
+
+
+def __getattr__(name: str):
+    if name == "requests":
+        return _get_requests()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _get_session() -> requests.Session:
+    """Return the shared session so repeated queries reuse keep-alive connections."""
+    global _SESSION
+    if _SESSION is None:
+        requests = _get_requests()
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        # Retry only failed connects (e.g. a stale keep-alive socket); read errors/timeouts and
+        # HTTP error statuses surface immediately so a slow response can't block for 3x timeout_s.
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=_POOL_CONNECTIONS,
+            pool_maxsize=_POOL_MAXSIZE,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2),
+        )
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def _loads(payload: bytes) -> Any:
+    """Decode a JSON body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
 def _extract_domain(url: str) -> str:
     try:
         parsed = urlparse(url)
@@ -35,15 +88,61 @@ def _extract_domain(url: str) -> str:
         return ""
 
 
+@dataclass(frozen=True)
+class _DomainRules:
+    """Normalized domain suffix rules with a set-probe path for long lists."""
+
+    suffixes: tuple[str, ...]
+    lookup: frozenset[str]
+    lengths: tuple[int, ...]
+
+    def __bool__(self) -> bool:
+        return bool(self.suffixes)
+
+    def matches(self, domain: str) -> bool:
+        if len(self.suffixes) <= _SET_PROBE_MIN_RULES:
+            # endswith(tuple) tests every rule in C rather than a Python-level any() per rule.
+            return domain.endswith(self.suffixes)
+        # A rule matches iff the domain's tail of that rule's length is in the set, so probe
+        # once per distinct rule length instead of once per rule. That bounds the work by the
+        # domain's length no matter how many rules there are; lengths are sorted, so stop at
+        # the first one longer than the domain.
+        size = len(domain)
+        for length in self.lengths:
+            if length > size:
+                break
+            if domain[size - length :] in self.lookup:
+                return True
+        return False
+
+
+_SET_PROBE_MIN_RULES = 64
+_RULES_CACHE: dict[tuple, _DomainRules] = {}
+_RULES_CACHE_SIZE = 16
+
+
+def _compile_rules(domains: Optional[list[str]]) -> _DomainRules:
+    """Normalize a domain list once per distinct list."""
+    key = tuple(domains or ())
+    rules = _RULES_CACHE.get(key)
+    if rules is None:
+        suffixes = tuple(dict.fromkeys(d.lower().strip() for d in key if d))
+        rules = _DomainRules(suffixes, frozenset(suffixes), tuple(sorted({len(d) for d in suffixes})))
+        if len(_RULES_CACHE) >= _RULES_CACHE_SIZE:
+            _RULES_CACHE.clear()
+        _RULES_CACHE[key] = rules
+    return rules
+
+
 def _filter_results(results: List[WebResult], allowlist: list[str], blocklist: list[str]) -> List[WebResult]:
-    allow = [d.lower().strip() for d in allowlist if d] if allowlist else []
-    block = [d.lower().strip() for d in blocklist if d] if blocklist else []
+    allow = _compile_rules(allowlist)
+    block = _compile_rules(blocklist)
     filtered = []
     for res in results:
         domain = res.source.lower() if res.source else _extract_domain(res.url)
-        if block and any(domain.endswith(b) for b in block):
+        if block and block.matches(domain):
             continue
-        if allow and not any(domain.endswith(a) for a in allow):
+        if allow and not allow.matches(domain):
             continue
         filtered.append(res)
     return filtered
@@ -58,14 +157,15 @@ def _serpapi_search(query: str, api_key: str, max_results: int, timeout_s: int)
         "api_key": api_key,
         "num": max_results,
     }
+    request_error = _get_requests().RequestException
     try:
-        resp = requests.get("https://serpapi.com/search", params=params, timeout=timeout_s)
-    except (requests.RequestException, socket.timeout) as exc:
+        resp = _get_session().get("https://serpapi.com/search", params=params, timeout=timeout_s)
+    except (request_error, socket.timeout) as exc:
         raise WebSearchError(f"SerpAPI request failed: {exc}") from exc
     if resp.status_code != 200:
         raise WebSearchError(f"SerpAPI returned {resp.status_code}: {resp.text}")
     try:
-        data = resp.json()
+        data = _loads(resp.content)
     except Exception as exc:
         raise WebSearchError(f"Invalid JSON from SerpAPI: {resp.text}") from exc
 
@@ -95,6 +195,8 @@ def search(query: str, max_results: Optional[int] = None, config=None, allowlist
         raise WebSearchError(f"Unsupported web provider: {provider}")
 
     results = _serpapi_search(query, api_key=api_key, max_results=max_res, timeout_s=timeout_s)
+    if not allowlist and not blocklist:
+        return results
     return _filter_results(results, allowlist or [], blocklist or [])
 
 
@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import struct
+import uuid
+import zlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from rag_assistant.config import load_config
+from rag_assistant.db.base import release_memory_db
+from rag_assistant.db.sqlite import init_db
+from rag_assistant.services import notes_service
+
+
+class DummyEmbedder:
+    """Embedder stand-in recording each batch; vectors are zeros unless vector_for is given."""
+
+    def __init__(self, dim: int = 384, vector_for=None):
+        self.dim = dim
+        self.vector_for = vector_for or (lambda text: [0.0] * dim)
+        self.calls: list[list[str]] = []
+
+    def embed_texts(self, texts):
+        self.calls.append(list(texts))
+        return [self.vector_for(t) for t in texts]
+
+
+class DummyStore:
+    """QdrantStore stand-in; search serves hits keyed by subject_id (None for unfiltered)."""
+
+    def __init__(self):
+        self.hits: dict = {}
+        self.point_count = 1
+        self.search_calls: list = []
+        self.upserts: list = []
+        self.deleted: list = []
+        self.versions: list = []
+
+    def get_collection_point_count(self):
+        return self.point_count
+
+    def search(self, vector, subject_id, limit):
+        self.search_calls.append(subject_id)
+        return list(self.hits.get(subject_id, []))
+
+    def search_notes(self, vector, subject_id, limit):
+        return []
+
+    def upsert_chunks(self, vectors, payloads, ids):
+        self.upserts.append((vectors, payloads, ids))
+        if payloads and "version" in payloads[0]:
+            self.versions.append(payloads[0]["version"])
+
+    def delete_by_notes_id(self, notes_id):
+        self.deleted.append(notes_id)
+
+    def set_notes_version(self, notes_id, version):
+        self.versions.append(version)
+
+
+@pytest.fixture
+def dummy_embedder() -> DummyEmbedder:
+    return DummyEmbedder()
+
+
+@pytest.fixture
+def dummy_store() -> DummyStore:
+    return DummyStore()
+
+
+@pytest.fixture(scope="session")
+def _session_settings():
+    return load_config()
+
+
+@pytest.fixture
+def settings(_session_settings):
+    """Default settings parsed once per session; each test gets its own mutable copy."""
+    return _session_settings.model_copy(deep=True)
+
+
+@pytest.fixture(scope="session")
+def _template_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Schema-only SQLite file built once per session."""
+    path = tmp_path_factory.mktemp("tmpl") / "tmpl.db"
+    init_db(path)
+    return path
+
+
+@pytest.fixture
+def fresh_db(_template_db: Path, tmp_path: Path) -> Path:
+    """Per-test copy of the template DB at tmp_path/data/db/test.db.
+
+    The copy keeps the template's schema stamp (PRAGMA user_version), so the services'
+    init_db calls on this path return without re-running the schema or migrations.
+    """
+    db_path = tmp_path / "data" / "db" / "test.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # Page-level backup reads through the WAL, so no checkpoint or file copy is needed.
+    src = sqlite3.connect(_template_db)
+    dst = sqlite3.connect(db_path)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    return db_path
+
+
+@pytest.fixture(scope="session")
+def sample_pdf_bytes() -> bytes:
+    """One-page PDF built once per session; tests write it wherever they need a file."""
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    page = doc.new_page(width=200, height=200)
+    page.insert_text((50, 100), "Hello")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture(scope="session")
+def sample_png_bytes() -> bytes:
+    """10x10 black RGB PNG encoded with zlib, so tests don't need OpenCV to make one."""
+    width = height = 10
+    raw = b"".join(b"\x00" + b"\x00" * (width * 3) for _ in range(height))
+
+    def chunk(tag: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + tag + body + struct.pack(">I", zlib.crc32(tag + body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+@pytest.fixture
+def memory_db() -> Path:
+    """Unique shared-cache in-memory database URI, freed after the test."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    uri = Path(f"file:test_{worker}_{uuid.uuid4().hex}?mode=memory&cache=shared")
+    yield uri
+    release_memory_db(uri)
+
+
+@pytest.fixture
+def stub_notes_deps(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Route the notes embedder and Qdrant store to shared doubles, counting how often each is built."""
+    deps = SimpleNamespace(
+        embedder=DummyEmbedder(dim=2, vector_for=lambda text: [float(len(text))] * 2),
+        store=DummyStore(),
+        embedder_builds=0,
+        store_builds=0,
+    )
+
+    def make_embedder(*a, **k):
+        deps.embedder_builds += 1
+        return deps.embedder
+
+    def make_store():
+        deps.store_builds += 1
+        return deps.store
+
+    monkeypatch.setattr(notes_service, "Embedder", make_embedder)
+    monkeypatch.setattr(notes_service, "QdrantStore", make_store)
+    return deps
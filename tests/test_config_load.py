@@ -33,3 +33,51 @@ logging:
     assert Path(settings.app.logs_dir).exists()
     assert Path(settings.database.sqlite_path).parent.exists()
     assert settings.qdrant.collection_name == "test_collection"
+
+
+def test_load_config_cached_per_env(tmp_path: Path, monkeypatch):
+    from rag_assistant import config as config_module
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        f"""
+app:
+  data_root: {tmp_path / "data"}
+  logs_dir: {tmp_path / "logs"}
+database:
+  sqlite_path: {tmp_path / "data" / "db" / "test.db"}
+""",
+        encoding="utf-8",
+    )
+    parsed = []
+    real_load_yaml = config_module._load_yaml
+    monkeypatch.setattr(config_module, "_load_yaml", lambda path: parsed.append(path) or real_load_yaml(path))
+    monkeypatch.delenv("RETRIEVAL_TOP_K", raising=False)
+
+    first = load_config(config_path)
+    first.retrieval.top_k = 99
+    second = load_config(config_path)
+    assert len(parsed) == 1
+    assert second.retrieval.top_k != 99  # callers get independent copies
+
+    monkeypatch.setenv("RETRIEVAL_TOP_K", "3")
+    third = load_config(config_path)
+    assert len(parsed) == 2
+    assert third.retrieval.top_k == 3
+
+
+def test_load_config_reads_dotenv_once_and_recreates_missing_dirs(tmp_path: Path, monkeypatch):
+    import shutil
+
+    from rag_assistant import config as config_module
+
+    reads = []
+    monkeypatch.setattr(config_module, "load_dotenv", lambda: reads.append(1))
+    monkeypatch.setattr(config_module, "_DOTENV_LOADED", False)
+    monkeypatch.setenv("DATA_ROOT", str(tmp_path / "data"))
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "data" / "db" / "test.db"))
+    load_config()
+    shutil.rmtree(tmp_path / "data")
+    settings = load_config()
+    assert reads == [1]
+    assert Path(settings.database.sqlite_path).parent.is_dir()
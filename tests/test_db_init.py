@@ -1,7 +1,8 @@
+import os
 from pathlib import Path
 import sqlite3
 
-from rag_assistant.db.sqlite import init_db
+from rag_assistant.db.sqlite import execute, execute_many, fetch_column, init_db
 
 
 def test_init_db_creates_tables(tmp_path: Path):
@@ -33,3 +34,102 @@ def test_init_db_idempotent(tmp_path: Path):
     # run again should not raise or corrupt
     init_db(db_path)
     assert db_path.exists()
+
+
+def test_init_db_enables_wal(tmp_path: Path):
+    db_path = tmp_path / "db" / "wal.db"
+    init_db(db_path)
+    with sqlite3.connect(db_path) as conn:
+        mode = conn.execute("PRAGMA journal_mode;").fetchone()[0]
+    assert mode.lower() == "wal"
+
+
+def test_execute_many_inserts_all_rows(tmp_path: Path):
+    db_path = tmp_path / "db" / "many.db"
+    init_db(db_path)
+    rows = [("s1", "One", 0.0), ("s2", "Two", 0.0), ("s3", "Three", 0.0)]
+    execute_many(db_path, "INSERT INTO subjects (subject_id, name, created_at) VALUES (?, ?, ?);", rows)
+    with sqlite3.connect(db_path) as conn:
+        count = conn.execute("SELECT COUNT(*) FROM subjects;").fetchone()[0]
+    assert count == 3
+
+
+def test_fetch_column_returns_first_column(tmp_path: Path):
+    db_path = tmp_path / "db" / "column.db"
+    init_db(db_path)
+    rows = [("s1", "One", 1.0), ("s2", "Two", 2.0)]
+    execute_many(db_path, "INSERT INTO subjects (subject_id, name, created_at) VALUES (?, ?, ?);", rows)
+    names = fetch_column(db_path, "SELECT name FROM subjects WHERE created_at > ? ORDER BY created_at;", (0,))
+    assert names == ["One", "Two"]
+
+
+def test_memory_uri_database_persists_across_connections(memory_db: Path):
+    init_db(memory_db)
+    execute(memory_db, "INSERT INTO subjects (subject_id, name, created_at) VALUES ('s1', 'S', 0.0);")
+    assert fetch_column(memory_db, "SELECT subject_id FROM subjects;") == ["s1"]
+
+
+def test_helpers_reuse_connection_until_db_file_replaced(tmp_path: Path):
+    from rag_assistant.db import sqlite as db
+
+    replacement = tmp_path / "replacement.db"
+    init_db(replacement)
+    db.close_cached_connections()
+
+    db_path = tmp_path / "db" / "test.db"
+    init_db(db_path)
+    first = db._cached_connection(db_path)
+    execute(db_path, "INSERT INTO subjects (subject_id, name, created_at) VALUES ('s1', 'S', 0.0);")
+    assert db._cached_connection(db_path) is first
+
+    # Swap a fresh database into place; the cached connection still points at the old file.
+    # Drop the old WAL sidecars as a real swap must, or SQLite would replay them onto the new file.
+    os.replace(replacement, db_path)
+    for suffix in ("-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    assert fetch_column(db_path, "SELECT subject_id FROM subjects;") == []
+    assert db._cached_connection(db_path) is not first
+
+
+def test_init_db_skips_schema_work_for_a_stamped_fresh_db(fresh_db: Path, monkeypatch):
+    import rag_assistant.db.sqlite as sqlite_mod
+
+    with sqlite3.connect(fresh_db) as conn:
+        assert conn.execute("PRAGMA user_version;").fetchone()[0] == sqlite_mod.schema_fingerprint()
+
+    def fail(*a, **k):
+        raise AssertionError("schema setup should be skipped")
+
+    monkeypatch.setattr(sqlite_mod, "apply_migrations", fail)
+    init_db(fresh_db)
+
+
+def test_init_db_reruns_when_the_schema_stamp_is_stale(fresh_db: Path, monkeypatch):
+    import rag_assistant.db.sqlite as sqlite_mod
+
+    calls = []
+    monkeypatch.setattr(sqlite_mod, "apply_migrations", calls.append)
+    with sqlite3.connect(fresh_db) as conn:
+        conn.execute("PRAGMA user_version = 0;")
+    init_db(fresh_db)
+    assert calls == [fresh_db]
+
+
+def test_synchronous_normal_only_under_wal(tmp_path: Path):
+    from rag_assistant.db.base import get_connection
+
+    journal_db = tmp_path / "journal.db"
+    sqlite3.connect(journal_db).close()
+    conn = get_connection(journal_db)
+    try:
+        assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 2  # FULL
+    finally:
+        conn.close()
+
+    wal_db = tmp_path / "db" / "wal.db"
+    init_db(wal_db)
+    conn = get_connection(wal_db)
+    try:
+        assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 1  # NORMAL
+    finally:
+        conn.close()
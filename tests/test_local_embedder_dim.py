@@ -17,3 +17,41 @@ def test_local_embedder_dimension(monkeypatch):
     vecs = embedder.embed_texts(["hello"])
     assert len(vecs[0]) == 384
     assert get_embedding_dim() == 384
+
+
+def test_local_model_import_deferred_until_first_use(monkeypatch):
+    import sys
+
+    import pytest
+
+    import rag_assistant.retrieval.embedder as emb
+
+    monkeypatch.setattr(emb, "SentenceTransformer", None)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+    emb._LOCAL_MODEL_CACHE.clear()
+    with pytest.raises(RuntimeError, match="sentence-transformers is not installed"):
+        emb._get_local_model("dummy")
+
+
+def test_concurrent_first_use_loads_model_once(monkeypatch):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    import rag_assistant.retrieval.embedder as emb
+
+    loads = []
+    lock = threading.Lock()
+
+    def slow_model(name):
+        with lock:
+            loads.append(name)
+        time.sleep(0.05)
+        return DummyModel()
+
+    monkeypatch.setattr(emb, "SentenceTransformer", slow_model)
+    monkeypatch.setattr(emb, "_LOCAL_MODEL_CACHE", {})
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        models = list(pool.map(emb._get_local_model, ["dummy"] * 4))
+    assert loads == ["dummy"]
+    assert all(m is models[0] for m in models)
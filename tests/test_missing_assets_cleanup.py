@@ -3,6 +3,7 @@ from pathlib import Path
 import pytest
 
 from rag_assistant.config import load_config
+from rag_assistant.db import sqlite as db
 from rag_assistant.db.sqlite import init_db
 from rag_assistant.ingest import pipeline
 from rag_assistant.services import asset_service, cleanup_service, subject_service
@@ -39,3 +40,18 @@ def test_missing_assets_marked_and_cleanup(tmp_path: Path, monkeypatch: pytest.M
     cleanup_service.remove_assets(subject["subject_id"], [asset["asset_id"]], remove_vectors=False)
     remaining = asset_service.list_assets(subject["subject_id"])
     assert all(a["asset_id"] != asset["asset_id"] for a in remaining)
+
+
+@pytest.mark.parametrize("count", [3, 40])
+def test_list_missing_files_keeps_row_order(fresh_db: Path, tmp_path: Path, count: int):
+    db.execute(fresh_db, "INSERT INTO subjects (subject_id, name, created_at) VALUES ('s', 'S', 0);")
+    rows = []
+    for i in range(count):
+        path = tmp_path / f"asset_{i}.pdf"
+        if i % 3 == 0:
+            path.write_bytes(b"x")
+        rows.append((f"a{i:03d}", "s", path.name, str(path), f"h{i}", 1, None, float(i), "stored", None))
+    db.execute_many(fresh_db, "INSERT INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);", rows)
+
+    missing = db.list_assets_with_missing_files(fresh_db, "s")
+    assert [m["asset_id"] for m in missing] == [f"a{i:03d}" for i in range(count) if i % 3]
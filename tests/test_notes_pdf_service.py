@@ -1,4 +1,6 @@
-import fitz
+import pytest
+
+fitz = pytest.importorskip("fitz")
 
 from rag_assistant.services.notes_pdf_service import render_notes_markdown_to_pdf
 
@@ -1,54 +1,59 @@
+from collections import deque
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
 from rag_assistant.config import load_config
-from rag_assistant.db.sqlite import execute, init_db
+from rag_assistant.db.sqlite import execute, execute_many
 from rag_assistant.services import asset_service, notes_quality, notes_service, subject_service
 from rag_assistant.web.search_client import WebResult
 from rag_assistant.rag.judge import JudgeDecision
 
 
-def _setup_subject_and_asset(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
-    data_root = tmp_path / "data"
-    db_path = data_root / "db" / "test.db"
+def _setup_subject_and_asset(db_path: Path, monkeypatch: pytest.MonkeyPatch, chunk_texts=("Intro to testing",)):
+    data_root = db_path.parents[1]
     monkeypatch.setenv("DATA_ROOT", str(data_root))
     monkeypatch.setenv("DB_PATH", str(db_path))
     cfg = load_config()
-    init_db(db_path)
     subject = subject_service.create_subject("Test Subject")
     asset = asset_service.add_asset(subject["subject_id"], "sample.pdf", b"file-bytes", "application/pdf")
-    execute(
+    execute_many(
         db_path,
         "INSERT INTO chunks (chunk_id, subject_id, asset_id, page_num, text, bbox_json, start_block, end_block, created_at) VALUES (?, ?, ?, ?, ?, '{}', 0, 0, 0.0);",
-        ("chunk1", subject["subject_id"], asset["asset_id"], 1, "Intro to testing"),
+        [
+            (f"chunk{i}", subject["subject_id"], asset["asset_id"], 1, text)
+            for i, text in enumerate(chunk_texts, start=1)
+        ],
     )
     return cfg, subject, asset, db_path
 
 
-def test_generate_notes_creates_rows(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    cfg, subject, asset, db_path = _setup_subject_and_asset(tmp_path, monkeypatch)
+def _keep_draft(draft, cfg, trace=None):
+    return draft
 
-    class DummyEmbedder:
-        def __init__(self, *a, **k):
-            pass
 
-        def embed_texts(self, texts):
-            return [[0.1] * 2 for _ in texts]
+def _patch_llm(monkeypatch: pytest.MonkeyPatch, *, answer=None, quality=None, quality_llm=None, search=None, judge_decision=None):
+    """Patch the notes LLM seams in one place; strings become canned responses, None leaves the real code."""
 
-    store_calls = {"upserts": 0, "payloads": [], "deleted": []}
-    calls = {"llm": [], "revise": []}
+    def as_llm(value):
+        return value if callable(value) else (lambda prompt, cfg, **kwargs: value)
 
-    class DummyStore:
-        def delete_by_notes_id(self, notes_id):
-            store_calls["deleted"].append(notes_id)
+    patches = [
+        (notes_service, "generate_answer", answer and as_llm(answer)),
+        (notes_service, "run_quality_loop", quality),
+        (notes_quality, "generate_answer", quality_llm and as_llm(quality_llm)),
+        (notes_service.search_client, "search", search),
+        (notes_service.judge, "should_search_web", judge_decision and (lambda *a, **k: judge_decision)),
+    ]
+    for target, name, value in patches:
+        if value is not None:
+            monkeypatch.setattr(target, name, value)
 
-        def upsert_chunks(self, vectors, payloads, ids):
-            store_calls["upserts"] += 1
-            store_calls["payloads"] = payloads
 
-    monkeypatch.setattr(notes_service, "Embedder", lambda *a, **k: DummyEmbedder())
-    monkeypatch.setattr(notes_service, "QdrantStore", lambda: DummyStore())
+def test_generate_notes_creates_rows(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
+    calls = {"llm": [], "revise": []}
 
     def fake_answer(prompt, cfg, **kwargs):
         calls["llm"].append(prompt)
@@ -58,8 +63,7 @@ def test_generate_notes_creates_rows(monkeypatch: pytest.MonkeyPatch, tmp_path:
         calls["revise"].append(draft)
         return draft + "\n\n## Improvements\n- Added clarity"
 
-    monkeypatch.setattr(notes_service, "generate_answer", fake_answer)
-    monkeypatch.setattr(notes_service, "run_quality_loop", fake_quality)
+    _patch_llm(monkeypatch, answer=fake_answer, quality=fake_quality)
 
     res = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
     notes_row = execute(db_path, "SELECT * FROM notes WHERE notes_id = ?;", (res["notes_id"],), fetchone=True)
@@ -68,36 +72,30 @@ def test_generate_notes_creates_rows(monkeypatch: pytest.MonkeyPatch, tmp_path:
     assert notes_row is not None
     assert notes_row["version"] == 1
     assert chunks
-    assert store_calls["upserts"] == 1
-    first_payload = store_calls["payloads"][0]
+    assert len(stub_notes_deps.store.upserts) == 1
+    first_payload = stub_notes_deps.store.upserts[-1][1][0]
     assert first_payload["source_type"] == "notes"
     assert first_payload["source_label"] == "Generated Notes"
     assert first_payload["version"] == 1
-    assert store_calls["deleted"]
+    assert stub_notes_deps.store.deleted
     assert len(calls["llm"]) == 1  # draft
     assert calls["revise"]  # critique loop invoked
 
 
-def test_generate_traces_quality(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    cfg, subject, asset, db_path = _setup_subject_and_asset(tmp_path, monkeypatch)
-    cfg.notes.generation.min_chars = 0
-    trace: list[str] = []
-
-    class DummyEmbedder:
-        def embed_texts(self, texts):
-            return [[0.21] * 2 for _ in texts]
+@pytest.mark.parametrize("n_chunks", [1, 10, 1000])
+def test_setup_inserts_chunks_in_one_batch(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, n_chunks: int):
+    texts = [f"Chunk text {i}" for i in range(n_chunks)]
+    _, _, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch, chunk_texts=texts)
+    row = execute(db_path, "SELECT COUNT(*) AS n FROM chunks WHERE asset_id = ?;", (asset["asset_id"],), fetchone=True)
+    assert row["n"] == n_chunks
 
-    class DummyStore:
-        def delete_by_notes_id(self, notes_id):
-            pass
 
-        def upsert_chunks(self, vectors, payloads, ids):
-            pass
+def test_generate_traces_quality(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
+    cfg.notes.generation.min_chars = 0
+    trace: list[str] = []
 
-    monkeypatch.setattr(notes_service, "Embedder", lambda *a, **k: DummyEmbedder())
-    monkeypatch.setattr(notes_service, "QdrantStore", lambda: DummyStore())
-    monkeypatch.setattr(notes_service, "generate_answer", lambda prompt, cfg, **kwargs: "## Draft\nBody")
-    monkeypatch.setattr(notes_quality, "generate_answer", lambda prompt, cfg, **kwargs: "## Revised\nBody")
+    _patch_llm(monkeypatch, answer="## Draft\nBody", quality_llm="## Revised\nBody")
 
     notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg, trace=trace)
     assert any("draft_generate:start" in m for m in trace)
@@ -111,26 +109,12 @@ def test_generate_traces_quality(monkeypatch: pytest.MonkeyPatch, tmp_path: Path
     assert draft_idx < judge1_idx < judge2_idx
 
 
-def test_regenerate_pipeline_matches_generate(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    cfg, subject, asset, db_path = _setup_subject_and_asset(tmp_path, monkeypatch)
+def test_regenerate_pipeline_matches_generate(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
     cfg.notes.generation.min_chars = 0
     trace: list[str] = []
 
-    class DummyEmbedder:
-        def embed_texts(self, texts):
-            return [[0.22] * 2 for _ in texts]
-
-    class DummyStore:
-        def delete_by_notes_id(self, notes_id):
-            pass
-
-        def upsert_chunks(self, vectors, payloads, ids):
-            pass
-
-    monkeypatch.setattr(notes_service, "Embedder", lambda *a, **k: DummyEmbedder())
-    monkeypatch.setattr(notes_service, "QdrantStore", lambda: DummyStore())
-    monkeypatch.setattr(notes_service, "generate_answer", lambda prompt, cfg, **kwargs: "## Draft\nBody")
-    monkeypatch.setattr(notes_quality, "generate_answer", lambda prompt, cfg, **kwargs: "## Revised\nBody")
+    _patch_llm(monkeypatch, answer="## Draft\nBody", quality_llm="## Revised\nBody")
 
     notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg, trace=trace)
     notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg, trace=trace)
@@ -142,8 +126,8 @@ def test_regenerate_pipeline_matches_generate(monkeypatch: pytest.MonkeyPatch, t
     assert len(judge_starts) == 4  # two rounds per generate call
 
 
-def test_generation_uses_notes_config(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    cfg, subject, asset, db_path = _setup_subject_and_asset(tmp_path, monkeypatch)
+def test_generation_uses_notes_config(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
     cfg.notes.generation.temperature = 0.05
     cfg.notes.generation.top_p = 0.7
     cfg.notes.generation.seed = 123
@@ -151,20 +135,6 @@ def test_generation_uses_notes_config(monkeypatch: pytest.MonkeyPatch, tmp_path:
     cfg.notes.generation.target_chars = 500
     cfg.notes.generation.min_chars = 0
 
-    class DummyEmbedder:
-        def __init__(self, *a, **k):
-            pass
-
-        def embed_texts(self, texts):
-            return [[0.11] * 2 for _ in texts]
-
-    class DummyStore:
-        def delete_by_notes_id(self, notes_id):
-            pass
-
-        def upsert_chunks(self, vectors, payloads, ids):
-            pass
-
     calls = []
 
     def fake_generate(prompt, cfg, **kwargs):
@@ -173,10 +143,7 @@ def test_generation_uses_notes_config(monkeypatch: pytest.MonkeyPatch, tmp_path:
             return "## Revised\nContent"
         return "## Draft\nBody"
 
-    monkeypatch.setattr(notes_service, "Embedder", lambda *a, **k: DummyEmbedder())
-    monkeypatch.setattr(notes_service, "QdrantStore", lambda: DummyStore())
-    monkeypatch.setattr(notes_service, "generate_answer", fake_generate)
-    monkeypatch.setattr(notes_quality, "generate_answer", fake_generate)
+    _patch_llm(monkeypatch, answer=fake_generate, quality_llm=fake_generate)
 
     notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
     assert len(calls) >= 3  # draft + judge + critique (+ possible second judge/revise)
@@ -189,69 +156,30 @@ def test_generation_uses_notes_config(monkeypatch: pytest.MonkeyPatch, tmp_path:
         assert call_kwargs.get("min_chars") in {None, 0}
 
 
-def test_length_expansion_only_when_min_positive(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    cfg, subject, asset, db_path = _setup_subject_and_asset(tmp_path, monkeypatch)
+def test_length_expansion_only_when_min_positive(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
     cfg.notes.generation.min_chars = 10
     trace: list[str] = []
 
-    class DummyEmbedder:
-        def embed_texts(self, texts):
-            return [[0.12] * 2 for _ in texts]
-
-    class DummyStore:
-        def delete_by_notes_id(self, notes_id):
-            pass
-
-        def upsert_chunks(self, vectors, payloads, ids):
-            pass
-
     def fake_generate(prompt, cfg, **kwargs):
         # return very short text to trigger expansion
         return "short"
 
-    monkeypatch.setattr(notes_service, "Embedder", lambda *a, **k: DummyEmbedder())
-    monkeypatch.setattr(notes_service, "QdrantStore", lambda: DummyStore())
-    monkeypatch.setattr(notes_service, "generate_answer", fake_generate)
-    monkeypatch.setattr(notes_quality, "generate_answer", fake_generate)
+    _patch_llm(monkeypatch, answer=fake_generate, quality_llm=fake_generate)
 
     notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg, trace=trace)
     assert any("expand_for_length" in m for m in trace)
 
 
-def test_regenerate_notes_runs_quality_loop(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    cfg, subject, asset, db_path = _setup_subject_and_asset(tmp_path, monkeypatch)
-
-    class DummyEmbedder:
-        def __init__(self, *a, **k):
-            pass
-
-        def embed_texts(self, texts):
-            return [[0.15] * 2 for _ in texts]
-
+def test_regenerate_notes_runs_quality_loop(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
     calls = {"revise": 0}
 
-    class DummyStore:
-        def __init__(self):
-            self.deleted = []
-            self.versions = []
-
-        def delete_by_notes_id(self, notes_id):
-            self.deleted.append(notes_id)
-
-        def upsert_chunks(self, vectors, payloads, ids):
-            if payloads:
-                self.versions.append(payloads[0]["version"])
-
-    store = DummyStore()
-    monkeypatch.setattr(notes_service, "Embedder", lambda *a, **k: DummyEmbedder())
-    monkeypatch.setattr(notes_service, "QdrantStore", lambda: store)
-    monkeypatch.setattr(notes_service, "generate_answer", lambda prompt, cfg, **kwargs: "## Draft\nBody")
-
     def fake_quality(draft, cfg, trace=None):
         calls["revise"] += 1
         return draft + "\n\nMore detail"
 
-    monkeypatch.setattr(notes_service, "run_quality_loop", fake_quality)
+    _patch_llm(monkeypatch, answer="## Draft\nBody", quality=fake_quality)
 
     first = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
     second = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
@@ -259,41 +187,18 @@ def test_regenerate_notes_runs_quality_loop(monkeypatch: pytest.MonkeyPatch, tmp
     assert first["version"] == 1
     assert second["version"] == 2
     assert calls["revise"] == 2  # both first gen and regenerate hit critique pass
-    assert 1 in store.versions and 2 in store.versions
-
-
-def test_update_notes_increments_version(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    cfg, subject, asset, db_path = _setup_subject_and_asset(tmp_path, monkeypatch)
+    assert 1 in stub_notes_deps.store.versions and 2 in stub_notes_deps.store.versions
 
-    class DummyEmbedder:
-        def embed_texts(self, texts):
-            return [[0.2] * 2 for _ in texts]
 
+def test_update_notes_increments_version(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
     calls = {"revise": 0}
 
-    class DummyStore:
-        def __init__(self):
-            self.deleted = []
-            self.upserts = 0
-            self.payloads = []
-
-        def delete_by_notes_id(self, notes_id):
-            self.deleted.append(notes_id)
-
-        def upsert_chunks(self, vectors, payloads, ids):
-            self.upserts += 1
-            self.payloads = payloads
-
-    store = DummyStore()
-    monkeypatch.setattr(notes_service, "Embedder", lambda *a, **k: DummyEmbedder())
-    monkeypatch.setattr(notes_service, "QdrantStore", lambda: store)
-    monkeypatch.setattr(notes_service, "generate_answer", lambda prompt, cfg, **kwargs: "## Intro\nDetails")
-
     def fake_quality(draft, cfg, trace=None):
         calls["revise"] += 1
         return draft
 
-    monkeypatch.setattr(notes_service, "run_quality_loop", fake_quality)
+    _patch_llm(monkeypatch, answer="## Intro\nDetails", quality=fake_quality)
 
     initial = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
     updated = notes_service.update_notes(initial["notes_id"], "# Updated\nNew content", config=cfg)
@@ -302,44 +207,30 @@ def test_update_notes_increments_version(monkeypatch: pytest.MonkeyPatch, tmp_pa
     assert updated["version"] == 2
     assert row["version"] == 2
     assert "Updated" in row["markdown"]
-    assert store.deleted  # deletion before re-upsert
-    assert store.upserts >= 1
-    assert store.payloads[0]["source_label"] == "From User Notes"
-    assert store.payloads[0]["version"] == 2
+    assert stub_notes_deps.store.deleted  # deletion before re-upsert
+    assert len(stub_notes_deps.store.upserts) >= 1
+    assert stub_notes_deps.store.upserts[-1][1][0]["source_label"] == "From User Notes"
+    assert stub_notes_deps.store.upserts[-1][1][0]["version"] == 2
     assert calls["revise"] == 1
 
 
-def test_web_augmentation_bounded(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    cfg, subject, asset, db_path = _setup_subject_and_asset(tmp_path, monkeypatch)
+def test_web_augmentation_bounded(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
     cfg.web.enabled = True
     cfg.web.max_web_queries_per_question = 1
 
-    class DummyEmbedder:
-        def embed_texts(self, texts):
-            return [[0.3] * 2 for _ in texts]
-
-    class DummyStore:
-        def delete_by_notes_id(self, notes_id):
-            pass
-
-        def upsert_chunks(self, vectors, payloads, ids):
-            pass
-
     counter = {"calls": 0}
 
     def fake_search(query, config=None, allowlist=None, blocklist=None):
         counter["calls"] += 1
         return [WebResult(title=query, url="http://example.com", snippet="snippet", source="example")]
 
-    monkeypatch.setattr(notes_service, "Embedder", lambda *a, **k: DummyEmbedder())
-    monkeypatch.setattr(notes_service, "QdrantStore", lambda: DummyStore())
-    monkeypatch.setattr(notes_service, "generate_answer", lambda prompt, cfg, **kwargs: "## With web\ndata")
-    monkeypatch.setattr(notes_service, "run_quality_loop", lambda draft, cfg, trace=None: draft)
-    monkeypatch.setattr(notes_service.search_client, "search", fake_search)
-    monkeypatch.setattr(
-        notes_service.judge,
-        "should_search_web",
-        lambda *a, **k: JudgeDecision(do_search=True, reason="force", suggested_queries=["q1", "q2"]),
+    _patch_llm(
+        monkeypatch,
+        answer="## With web\ndata",
+        quality=_keep_draft,
+        search=fake_search,
+        judge_decision=JudgeDecision(do_search=True, reason="force", suggested_queries=["q1", "q2"]),
     )
 
     res = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
@@ -349,33 +240,13 @@ def test_web_augmentation_bounded(monkeypatch: pytest.MonkeyPatch, tmp_path: Pat
     assert notes_row is not None
 
 
-def test_diff_preserves_labels_for_unchanged(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    cfg, subject, asset, db_path = _setup_subject_and_asset(tmp_path, monkeypatch)
-
-    class DummyEmbedder:
-        def embed_texts(self, texts):
-            return [[0.4] * 2 for _ in texts]
-
-    class DummyStore:
-        def __init__(self):
-            self.deleted = []
-            self.payloads = []
-
-        def delete_by_notes_id(self, notes_id):
-            self.deleted.append(notes_id)
-
-        def upsert_chunks(self, vectors, payloads, ids):
-            self.payloads = payloads
-
-    store = DummyStore()
-    monkeypatch.setattr(notes_service, "Embedder", lambda *a, **k: DummyEmbedder())
-    monkeypatch.setattr(notes_service, "QdrantStore", lambda: store)
+def test_diff_preserves_labels_for_unchanged(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
 
     def fake_answer(prompt, cfg, **kwargs):
         return "# Section One\nKeep line\n\n# Section Two\nStay put"
 
-    monkeypatch.setattr(notes_service, "generate_answer", fake_answer)
-    monkeypatch.setattr(notes_service, "run_quality_loop", lambda draft, cfg, trace=None: draft)
+    _patch_llm(monkeypatch, answer=fake_answer, quality=_keep_draft)
 
     initial = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
     row_before = execute(db_path, "SELECT meta_json FROM notes WHERE notes_id = ?;", (initial["notes_id"],), fetchone=True)
@@ -384,8 +255,168 @@ def test_diff_preserves_labels_for_unchanged(monkeypatch: pytest.MonkeyPatch, tm
     updated_markdown = "# Section One\nEdited line\n\n# Section Two\nStay put"
     notes_service.update_notes(initial["notes_id"], updated_markdown, edited_by="user", config=cfg)
     # payloads from last upsert
-    labels = [p["source_label"] for p in store.payloads]
+    labels = [p["source_label"] for p in stub_notes_deps.store.upserts[-1][1]]
     assert "From User Notes" in labels
     assert "Generated Notes" in labels  # unchanged section retains original provenance
     # ensure old vectors removed before upsert
-    assert initial["notes_id"] in store.deleted
+    assert initial["notes_id"] in stub_notes_deps.store.deleted
+
+
+def test_embedder_and_store_reused_across_calls(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
+    _patch_llm(monkeypatch, answer="## Draft\nBody", quality=_keep_draft)
+
+    first = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
+    notes_service.update_notes(first["notes_id"], "## Draft\nEdited", config=cfg)
+    assert stub_notes_deps.embedder_builds == 1
+    assert stub_notes_deps.store_builds == 1
+
+
+def test_unchanged_draft_sections_reuse_prefetched_vectors(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
+    _patch_llm(
+        monkeypatch, answer="## Keep\nSame body", quality=lambda draft, cfg, trace=None: draft + "\n\n## Added\nNew body"
+    )
+
+    notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
+    assert stub_notes_deps.embedder.calls == [["Same body"], ["New body"]]
+    assert len(stub_notes_deps.store.upserts[-1][0]) == 2
+
+
+def test_streamed_draft_sections_embedded_before_draft_completes(
+    monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace
+):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
+
+    def fake_stream(prompt, cfg, on_token=None, **kwargs):
+        fragments = ["## One\nFirst", " body\n", "## Two\nSecond body"]
+        for fragment in fragments:
+            on_token(fragment)
+        return "".join(fragments)
+
+    _patch_llm(monkeypatch, answer=fake_stream, quality=_keep_draft)
+
+    notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
+    assert sorted(stub_notes_deps.embedder.calls) == [["First body"], ["Second body"]]
+
+
+def test_identical_chunks_embedded_once(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
+    _patch_llm(monkeypatch, answer="## Draft\nBody", quality=_keep_draft)
+
+    first = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
+    stub_notes_deps.embedder.calls.clear()
+    notes_service.update_notes(first["notes_id"], "## A\nSame text\n\n## B\nSame text\n\n## C\nOther", config=cfg)
+    assert stub_notes_deps.embedder.calls == [["Same text", "Other"]]
+    assert stub_notes_deps.store.upserts[-1][0] == [[9.0, 9.0], [9.0, 9.0], [5.0, 5.0]]
+
+
+def test_resolve_chunk_labels_consumes_duplicates_in_order():
+    pool = {
+        "same text": deque(["Generated Notes", "From User Notes"]),
+    }
+    chunks = [{"text": "same   text"}, {"text": "new"}, {"text": "same text"}, {"text": "same text"}]
+    labels = notes_service._resolve_chunk_labels(chunks, pool)
+    assert labels == ["Generated Notes", "From User Notes", "From User Notes", "From User Notes"]
+
+
+def test_chunk_markdown_splits_long_sections():
+    body = "\n".join(["x" * 10] * 7)
+    chunks = notes_service._chunk_markdown(f"Intro line\n## Long\n{body}\n## Short\ntail", "nid", max_chars=30)
+    assert [c["section_title"] for c in chunks] == ["Overview"] + ["Long"] * 5 + ["Short"]
+    assert all(len(c["text"]) <= 30 for c in chunks)
+    assert "".join(c["text"] for c in chunks[1:6]).replace("\n", "") == "x" * 70
+    assert chunks[-1]["text"] == "tail"
+
+
+def test_notes_meta_stored_compact(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
+
+    res = notes_service.save_user_notes(subject["subject_id"], asset["asset_id"], "## Größe\nÜbersicht, Beispiel", config=cfg)
+    row = execute(db_path, "SELECT meta_json FROM notes WHERE notes_id = ?;", (res["notes_id"],), fetchone=True)
+    assert '"label":"From User Notes"' in row["meta_json"]
+    assert "Übersicht, Beispiel" in row["meta_json"]
+
+
+def test_fused_judge_revise_single_call_per_round(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
+    cfg.notes.generation.min_chars = 0
+    cfg.notes.fuse_judge_revise = True
+    trace: list[str] = []
+    prompts: list[str] = []
+    replies = iter(
+        [
+            '{"critique": "- add example", "needs_revision": true, "revised_markdown": "## Draft\\nBody with example"}',
+            '```json\n{"critique": "No major issues", "needs_revision": false, "revised_markdown": ""}\n```',
+        ]
+    )
+
+    def fake_quality_llm(prompt, cfg, **kwargs):
+        prompts.append(prompt)
+        return next(replies)
+
+    _patch_llm(monkeypatch, answer="## Draft\nBody", quality_llm=fake_quality_llm)
+
+    res = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg, trace=trace)
+    row = execute(db_path, "SELECT markdown FROM notes WHERE notes_id = ?;", (res["notes_id"],), fetchone=True)
+    assert len(prompts) == 2  # one fused call per round
+    assert row["markdown"] == "## Draft\nBody with example"
+    assert any("judge_review:start round=1 fused=true" in m for m in trace)
+    assert any("judge_review:start round=2 fused=true" in m for m in trace)
+    assert not any("revise:start" in m for m in trace)
+
+
+@pytest.mark.parametrize("flag", ['"false"', '"no"', "false"])
+def test_fused_judge_revise_keeps_draft_when_revision_declined(monkeypatch: pytest.MonkeyPatch, settings, flag):
+    cfg = settings
+    cfg.notes.generation.min_chars = 0
+    cfg.notes.fuse_judge_revise = True
+    reply = '{"critique": "Looks fine", "needs_revision": %s, "revised_markdown": "## Worse"}' % flag
+    _patch_llm(monkeypatch, quality_llm=lambda prompt, cfg, **kwargs: reply)
+    assert notes_quality.run_quality_loop("## Draft\nBody", cfg) == "## Draft\nBody"
+
+
+def test_fused_judge_revise_falls_back_when_unparsed(monkeypatch: pytest.MonkeyPatch, settings):
+    cfg = settings
+    cfg.notes.generation.min_chars = 0
+    cfg.notes.fuse_judge_revise = True
+    trace: list[str] = []
+
+    def fake_llm(prompt, cfg, **kwargs):
+        if "single JSON object" in prompt:
+            return "not json at all"
+        if "judging draft" in prompt:
+            return "No major issues"
+        return "## Revised"
+
+    _patch_llm(monkeypatch, quality_llm=fake_llm)
+    out = notes_quality.run_quality_loop("## Draft\nBody", cfg, trace=trace)
+    assert out == "## Draft\nBody"
+    assert any("judge_review:unparsed round=1" in m for m in trace)
+    assert any(m == "[NOTES] judge_review:start round=1" for m in trace)
+
+
+def test_regenerate_unchanged_markdown_skips_reindex(monkeypatch: pytest.MonkeyPatch, fresh_db: Path, stub_notes_deps: SimpleNamespace):
+    cfg, subject, asset, db_path = _setup_subject_and_asset(fresh_db, monkeypatch)
+    trace: list[str] = []
+    _patch_llm(monkeypatch, answer="## Draft\nBody", quality=_keep_draft)
+
+    first = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg, trace=trace)
+    second = notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg, trace=trace)
+
+    assert second["version"] == 2
+    assert second["chunk_count"] == first["chunk_count"]
+    assert len(stub_notes_deps.store.upserts) == 1
+    assert stub_notes_deps.store.versions == [1, 2]
+    assert any("index:skip_unchanged" in m for m in trace)
+
+    # Same markdown, but a different embedding model must land in the new vector space.
+    cfg.embeddings.model = "other-embedding-model"
+    notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
+    assert len(stub_notes_deps.store.upserts) == 2
+
+    notes_service.update_notes(first["notes_id"], "## Draft\nUser edit", config=cfg)
+    assert len(stub_notes_deps.store.upserts) == 3
+    cfg.notes.skip_unchanged_reindex = False
+    notes_service.generate_notes_for_asset(subject["subject_id"], asset["asset_id"], config=cfg)
+    assert len(stub_notes_deps.store.upserts) == 4
@@ -27,3 +27,12 @@ def test_empty_results():
 def test_malformed_safe():
     out = normalize_ocr_result(123, 1)
     assert out["blocks"] == []
+
+
+def test_bbox_from_quads_and_polygons():
+    quad = [[3, 1], [9, 2], [8, 7], [2, 6]]
+    out = normalize_ocr_result([[quad, ("quad", 0.5)], [[[0, 0], [4, 1], [2, 5]], ("tri", 0.5)], [[[1], [2]], ("bad", 0.5)]], 1)
+    bboxes = [b["bbox"] for b in out["blocks"]]
+    assert bboxes[0] == [2, 1, 9, 7]
+    assert bboxes[1] == [0, 0, 4, 5]
+    assert bboxes[2] == [0, 0, 1, 1]
@@ -1,4 +1,5 @@
 import json
+from types import SimpleNamespace
 
 import pytest
 import requests
@@ -16,7 +17,7 @@ class DummyResponse:
         return self._payload
 
 
-def test_ollama_client_success(monkeypatch):
+def test_ollama_client_success():
     captured = {}
 
     def fake_post(url, json=None, timeout=None):
@@ -25,19 +26,77 @@ def test_ollama_client_success(monkeypatch):
         captured["timeout"] = timeout
         return DummyResponse(200, {"response": "hello"})
 
-    monkeypatch.setattr(requests, "post", fake_post)
-    client = OllamaClient(base_url="http://127.0.0.1:11434", model="llama3.1:8b", timeout_s=10)
+    client = OllamaClient(
+        base_url="http://127.0.0.1:11434", model="llama3.1:8b", timeout_s=10, session=SimpleNamespace(post=fake_post)
+    )
     out = client.generate("prompt", temperature=0.2)
     assert out == "hello"
     assert captured["json"]["model"] == "llama3.1:8b"
     assert captured["json"]["stream"] is False
 
 
-def test_ollama_client_connection_error(monkeypatch):
+def test_ollama_client_connection_error():
     def fake_post(url, json=None, timeout=None):
         raise requests.RequestException("boom")
 
-    monkeypatch.setattr(requests, "post", fake_post)
-    client = OllamaClient()
+    client = OllamaClient(session=SimpleNamespace(post=fake_post))
     with pytest.raises(OllamaError):
         client.generate("prompt")
+
+
+class DummyStreamResponse:
+    def __init__(self, lines, status_code=200):
+        self.status_code = status_code
+        self._lines = lines
+        self.text = ""
+        self.closed = False
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+    def close(self):
+        self.closed = True
+
+
+def test_ollama_client_stream():
+    captured = {}
+    lines = [
+        json.dumps({"response": "## Head", "done": False}).encode(),
+        b"",
+        json.dumps({"response": "ing\nBody", "done": False}).encode(),
+        json.dumps({"response": "", "done": True}).encode(),
+    ]
+
+    def fake_post(url, json=None, timeout=None, stream=False):
+        captured["json"] = json
+        captured["stream"] = stream
+        captured["resp"] = DummyStreamResponse(lines)
+        return captured["resp"]
+
+    client = OllamaClient(session=SimpleNamespace(post=fake_post))
+    out = list(client.generate_stream("prompt", max_tokens=5))
+    assert out == ["## Head", "ing\nBody"]
+    assert captured["resp"].closed
+    assert captured["stream"] is True
+    assert captured["json"]["stream"] is True
+    assert captured["json"]["num_predict"] == 5
+
+
+@pytest.mark.parametrize("status_code, consume", [(200, 1), (500, 0)])
+def test_ollama_client_stream_closes_response_on_early_exit(status_code, consume):
+    lines = [json.dumps({"response": "a"}).encode(), json.dumps({"response": "b", "done": True}).encode()]
+    resp = DummyStreamResponse(lines, status_code=status_code)
+    client = OllamaClient(session=SimpleNamespace(post=lambda *a, **k: resp))
+    stream = client.generate_stream("prompt")
+    if consume:
+        assert next(stream) == "a"
+        stream.close()
+    else:
+        with pytest.raises(OllamaError):
+            next(stream)
+    assert resp.closed
+
+
+def test_ollama_client_defaults_to_requests(monkeypatch):
+    monkeypatch.setattr(requests, "post", lambda url, json=None, timeout=None: DummyResponse(200, {"response": "hi"}))
+    assert OllamaClient().generate("prompt") == "hi"
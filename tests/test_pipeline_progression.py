@@ -1,7 +1,5 @@
 from pathlib import Path
 
-import cv2
-import numpy as np
 import pytest
 
 from rag_assistant.config import load_config
@@ -10,9 +8,17 @@ from rag_assistant.ingest import pipeline
 from rag_assistant.services import asset_service, subject_service
 
 
-def test_pipeline_progression(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+def test_pipeline_progression(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    memory_db: Path,
+    sample_png_bytes: bytes,
+    dummy_embedder,
+    dummy_store,
+):
+    pytest.importorskip("cv2")  # image assets are sized with OpenCV during ingest
     data_root = tmp_path / "data"
-    db_path = data_root / "db" / "test.db"
+    db_path = memory_db
     monkeypatch.setenv("DATA_ROOT", str(data_root))
     monkeypatch.setenv("DB_PATH", str(db_path))
     cfg = load_config()
@@ -21,8 +27,7 @@ def test_pipeline_progression(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
 
     img_path = data_root / "sample.png"
     img_path.parent.mkdir(parents=True, exist_ok=True)
-    img = np.zeros((10, 10, 3), dtype=np.uint8)
-    cv2.imwrite(str(img_path), img)
+    img_path.write_bytes(sample_png_bytes)
     asset = asset_service.add_asset(subject["subject_id"], "sample.png", img_path.read_bytes(), "image/png")
 
     class DummyOCR:
@@ -32,25 +37,24 @@ def test_pipeline_progression(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
         def ocr_page(self, image_path: str, page_num: int):
             return {"page": page_num, "width": 10, "height": 10, "blocks": [{"text": "hello", "bbox": [0, 0, 5, 5], "confidence": 0.9}]}
 
-    class DummyEmbedder:
-        def __init__(self, *args, **kwargs):
-            pass
-
-        def embed_texts(self, texts):
-            return [[0.0] * cfg.qdrant.vector_size for _ in texts]
-
-    class DummyStore:
-        def __init__(self):
-            pass
-
-        def upsert_chunks(self, vectors, payloads, ids):
-            return None
+    dummy_embedder.dim = cfg.qdrant.vector_size
 
     monkeypatch.setattr(pipeline, "get_ocr_engine", lambda lang="en", config=None: (DummyOCR(), None, "dummy"))
-    monkeypatch.setattr(pipeline, "Embedder", DummyEmbedder)
-    monkeypatch.setattr(pipeline, "QdrantStore", DummyStore)
+    monkeypatch.setattr(pipeline, "Embedder", lambda *args, **kwargs: dummy_embedder)
+    monkeypatch.setattr(pipeline, "QdrantStore", lambda: dummy_store)
 
     pipeline.process_asset(subject["subject_id"], asset, cfg)
 
     status = asset_service.get_index_status(asset["asset_id"])
     assert status["stage"] == "indexed"
+    assert dummy_embedder.calls == [["hello"]]
+    assert len(dummy_store.upserts) == 1
+
+
+def test_sample_png_fixture_decodes(sample_png_bytes: bytes):
+    cv2 = pytest.importorskip("cv2")
+    np = pytest.importorskip("numpy")
+
+    img = cv2.imdecode(np.frombuffer(sample_png_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    assert img.shape == (10, 10, 3)
+    assert not img.any()
@@ -1,43 +1,41 @@
-from rag_assistant.retrieval.vector_store.qdrant import QdrantStore
+from types import SimpleNamespace
 
+import pytest
 
-class DummyInfoPoints:
-    def __init__(self):
-        self.points_count = 5
-
-
-class DummyInfoVectors:
-    def __init__(self):
-        self.vectors_count = 7
+from rag_assistant.retrieval.vector_store import qdrant as qstore
 
 
 class DummyClient:
-    def __init__(self, info):
+    def __init__(self, info=None):
         self._info = info
 
     def get_collection(self, name):
         return self._info
 
     def get_collections(self):
-        class C:
-            collections = []
-
-        return C()
-
-
-def test_collection_count_points(monkeypatch):
-    store = QdrantStore()
-    monkeypatch.setattr(store, "client", DummyClient(DummyInfoPoints()))
-    assert store.get_collection_point_count() == 5
-
-
-def test_collection_count_vectors(monkeypatch):
-    store = QdrantStore()
-    monkeypatch.setattr(store, "client", DummyClient(DummyInfoVectors()))
-    assert store.get_collection_point_count() == 7
-
-
-def test_collection_count_unknown(monkeypatch):
-    store = QdrantStore()
-    monkeypatch.setattr(store, "client", DummyClient(object()))
-    assert store.get_collection_point_count() == 0
+        return SimpleNamespace(collections=[])
+
+    def create_collection(self, **kwargs):
+        return None
+
+
+@pytest.fixture(scope="module")
+def store():
+    # Build once with a stub client so construction never probes a real Qdrant server.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(qstore, "QdrantClient", lambda url=None, api_key=None: DummyClient())
+        yield qstore.QdrantStore()
+
+
+@pytest.mark.parametrize(
+    "info, expected",
+    [
+        (SimpleNamespace(points_count=5), 5),
+        (SimpleNamespace(vectors_count=7), 7),
+        (object(), 0),
+    ],
+    ids=["points", "vectors", "unknown"],
+)
+def test_collection_count(monkeypatch, store, info, expected):
+    monkeypatch.setattr(store, "client", DummyClient(info))
+    assert store.get_collection_point_count() == expected
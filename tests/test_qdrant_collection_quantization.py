@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+from qdrant_client.http import models as qmodels
+
+from rag_assistant.retrieval.vector_store import qdrant as qstore
+
+
+class DummyClient:
+    def __init__(self):
+        self.created = {}
+
+    def get_collections(self):
+        return SimpleNamespace(collections=[])
+
+    def create_collection(self, **kwargs):
+        self.created = kwargs
+
+
+def _store_with_client(monkeypatch, enabled: bool):
+    client = DummyClient()
+    # Stub the client before construction so building the store never probes a real Qdrant server.
+    monkeypatch.setattr(qstore, "QdrantClient", lambda url=None, api_key=None: client)
+    store = qstore.QdrantStore()
+    store.cfg.qdrant.scalar_quantization = enabled
+    store.ensure_collection()
+    return client
+
+
+def test_new_collection_uses_int8_quantization(monkeypatch):
+    client = _store_with_client(monkeypatch, enabled=True)
+    quantization = client.created["quantization_config"]
+    assert isinstance(quantization, qmodels.ScalarQuantization)
+    assert quantization.scalar.type == qmodels.ScalarType.INT8
+    assert quantization.scalar.always_ram is True
+
+
+def test_quantization_can_be_disabled(monkeypatch):
+    client = _store_with_client(monkeypatch, enabled=False)
+    assert client.created["quantization_config"] is None
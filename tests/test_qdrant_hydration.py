@@ -1,8 +1,11 @@
 from types import SimpleNamespace
 from pathlib import Path
 
+import pytest
+
 from rag_assistant.config import Settings, AppConfig, DatabaseConfig, QdrantConfig, LoggingConfig, IngestConfig, RetrievalConfig, LLMConfig, EmbeddingsConfig
 from rag_assistant.db.base import get_connection
+from rag_assistant.db.sqlite import execute_many
 from rag_assistant.retrieval.vector_store import qdrant as qstore
 
 
@@ -36,64 +39,56 @@ class DummyClient:
         return self.points
 
 
-def test_qdrant_hydrates_from_sqlite(tmp_path, monkeypatch):
-    db_path = tmp_path / "db.sqlite"
-    db_path.parent.mkdir(parents=True, exist_ok=True)
+_CHUNKS_DDL = """
+CREATE TABLE chunks (
+    chunk_id TEXT,
+    subject_id TEXT,
+    asset_id TEXT,
+    page_num INTEGER,
+    text TEXT,
+    bbox_json TEXT,
+    start_block INTEGER,
+    end_block INTEGER,
+    created_at REAL
+);
+"""
+
+
+def _seed_chunks(db_path, rows) -> None:
     with get_connection(db_path) as conn:
-        conn.execute(
-            """
-            CREATE TABLE chunks (
-                chunk_id TEXT,
-                subject_id TEXT,
-                asset_id TEXT,
-                page_num INTEGER,
-                text TEXT,
-                bbox_json TEXT,
-                start_block INTEGER,
-                end_block INTEGER,
-                created_at REAL
-            );
-            """
-        )
-        conn.execute(
-            "INSERT INTO chunks (chunk_id, subject_id, asset_id, page_num, text, bbox_json, start_block, end_block, created_at) VALUES (?, ?, ?, ?, ?, '{}', 0, 0, 0.0);",
-            ("cid1", "subj1", "asset1", 1, "hello world"),
-        )
+        conn.execute(_CHUNKS_DDL)
         conn.commit()
+    execute_many(
+        db_path,
+        "INSERT INTO chunks (chunk_id, subject_id, asset_id, page_num, text, bbox_json, start_block, end_block, created_at) VALUES (?, ?, ?, ?, ?, '{}', 0, 0, 0.0);",
+        rows,
+    )
 
-    points = [SimpleNamespace(id="p1", score=0.9, payload={"chunk_id": "cid1", "asset_id": "asset1", "subject_id": "subj1"})]
+
+@pytest.mark.parametrize("n_chunks", [1, 50])
+def test_qdrant_hydrates_from_sqlite(memory_db, monkeypatch, n_chunks):
+    db_path = memory_db
+    _seed_chunks(db_path, [(f"cid{i}", "subj1", "asset1", i, f"text {i}") for i in range(1, n_chunks + 1)])
+
+    points = [
+        SimpleNamespace(id=f"p{i}", score=0.9, payload={"chunk_id": f"cid{i}", "asset_id": "asset1", "subject_id": "subj1"})
+        for i in range(1, n_chunks + 1)
+    ]
     monkeypatch.setattr(qstore, "QdrantClient", lambda url=None, api_key=None: DummyClient(points))
     monkeypatch.setattr(qstore, "load_config", lambda: _dummy_config(db_path))
 
     store = qstore.QdrantStore()
-    hits = store.search([0.1] * 384, subject_id="subj1", limit=5)
-    assert hits
-    hit = hits[0]
-    assert hit.get("text") == "hello world"
-    assert hit.get("page_num") == 1
-    assert hit.get("chunk_id") == "cid1"
+    hits = store.search([0.1] * 384, subject_id="subj1", limit=n_chunks)
+    assert len(hits) == n_chunks
+    for i, hit in enumerate(hits, start=1):
+        assert hit.get("text") == f"text {i}"
+        assert hit.get("page_num") == i
+        assert hit.get("chunk_id") == f"cid{i}"
 
 
-def test_qdrant_drops_hits_without_chunk_id(tmp_path, monkeypatch):
-    db_path = tmp_path / "db.sqlite"
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    with get_connection(db_path) as conn:
-        conn.execute(
-            """
-            CREATE TABLE chunks (
-                chunk_id TEXT,
-                subject_id TEXT,
-                asset_id TEXT,
-                page_num INTEGER,
-                text TEXT,
-                bbox_json TEXT,
-                start_block INTEGER,
-                end_block INTEGER,
-                created_at REAL
-            );
-            """
-        )
-        conn.commit()
+def test_qdrant_drops_hits_without_chunk_id(memory_db, monkeypatch):
+    db_path = memory_db
+    _seed_chunks(db_path, [])
 
     points = [SimpleNamespace(id="p1", score=0.9, payload={"text": "orphan"})]
     monkeypatch.setattr(qstore, "QdrantClient", lambda url=None, api_key=None: DummyClient(points))
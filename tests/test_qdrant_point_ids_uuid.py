@@ -1,6 +1,6 @@
 import uuid
 
-from rag_assistant.vectorstore.point_id import make_point_uuid
+from rag_assistant.vectorstore.point_id import make_point_uuid, make_point_uuids
 
 
 def test_point_uuid_deterministic():
@@ -10,3 +10,8 @@ def test_point_uuid_deterministic():
     assert pid1 == pid2
     uuid_obj = uuid.UUID(pid1)
     assert str(uuid_obj) == pid1
+
+
+def test_point_uuids_batch_matches_single():
+    identities = ["s1:a1:1:0", "s1:a1:1:1", "notes:abc", "unicodé:1"]
+    assert make_point_uuids(identities) == [make_point_uuid(i) for i in identities]
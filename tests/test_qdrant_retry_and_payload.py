@@ -46,3 +46,22 @@ def test_retry_without_subject_returns_hits(tmp_path, monkeypatch):
     hits = store.search([0.1, 0.2], subject_id="subj", limit=5)
     assert hits
     assert hits[0]["chunk_id"] == "c1"
+
+
+def test_set_notes_version_failure_is_logged(tmp_path, monkeypatch, caplog):
+    class Client:
+        def get_collections(self):
+            return SimpleNamespace(collections=[])
+
+        def create_collection(self, **kwargs):
+            return None
+
+        def set_payload(self, **kwargs):
+            raise RuntimeError("qdrant down")
+
+    monkeypatch.setattr(qstore, "QdrantClient", lambda url=None, api_key=None: Client())
+    monkeypatch.setattr(qstore, "load_config", lambda: _dummy_config(tmp_path / "db.sqlite"))
+    store = qstore.QdrantStore()
+    with caplog.at_level("WARNING", logger=qstore.logger.name):
+        store.set_notes_version("n1", 3)
+    assert any("notes version" in rec.getMessage() for rec in caplog.records)
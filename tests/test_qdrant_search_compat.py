@@ -1,37 +1,46 @@
 from types import SimpleNamespace
 
-from rag_assistant.retrieval.vector_store.qdrant import search_points
-
-
-class DummyClientSearch:
-    def __init__(self, res):
-        self._res = res
-
-    def search(self, **kwargs):
-        return self._res
-
+import pytest
 
-class DummyClientQueryPoints:
-    def __init__(self, res):
-        self._res = res
-
-    def query_points(self, **kwargs):
-        return self._res
-
-
-def test_search_path_uses_search():
-    point = SimpleNamespace(id="1", score=0.9, payload={"a": 1})
-    client = DummyClientSearch([point])
-    res = search_points(client, "col", [0.1], 5)
-    assert len(res) == 1
-    assert res[0].id == "1"
-    assert res[0].payload["a"] == 1
+from rag_assistant.retrieval.vector_store.qdrant import search_points
 
 
-def test_search_path_uses_query_points():
-    point = {"id": "2", "score": 0.8, "payload": {"b": 2}}
-    client = DummyClientQueryPoints({"result": {"points": [point]}})
-    res = search_points(client, "col", [0.1], 5)
-    assert len(res) == 1
-    assert res[0].id == "2"
-    assert res[0].payload["b"] == 2
+def make_client(method: str, res, called: dict | None = None):
+    """Client exposing only ``method``, which records its kwargs and returns ``res``."""
+
+    def call(**kwargs):
+        if called is not None:
+            called.update(kwargs)
+        return res
+
+    client = SimpleNamespace()
+    setattr(client, method, call)
+    return client
+
+
+@pytest.mark.parametrize(
+    "method, res",
+    [
+        ("search", [SimpleNamespace(id="1", score=0.9, payload={"a": 1})]),
+        ("query_points", {"result": {"points": [{"id": "1", "score": 0.8, "payload": {"a": 1}}]}}),
+    ],
+)
+def test_search_points_normalizes_results(method, res):
+    out = search_points(make_client(method, res), "col", [0.1], 5)
+    assert len(out) == 1
+    assert out[0].id == "1"
+    assert out[0].payload["a"] == 1
+
+
+@pytest.mark.parametrize(
+    "method, vector_key, filter_key",
+    [("search", "query_vector", "query_filter"), ("query_points", "query", "filter")],
+)
+def test_search_points_passes_query_vector(method, vector_key, filter_key):
+    called = {}
+    point = SimpleNamespace(id="1", score=0.9, payload={"chunk_id": "c1", "text": "hi", "page_num": 1})
+    res = search_points(make_client(method, [point], called), "col", [0.3, 0.4], 3, query_filter={"foo": "bar"}, with_payload=True)
+    assert res
+    assert called[vector_key] == [0.3, 0.4]
+    assert called[filter_key] == {"foo": "bar"}
+    assert called["with_payload"] is True
@@ -1,32 +1,61 @@
+import io
 from hashlib import sha256
 from pathlib import Path
 
 import pytest
 
 from rag_assistant.config import load_config
-from rag_assistant.db.sqlite import init_db
 from rag_assistant.services import asset_service, subject_service
 
 
-def setup_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
-    data_root = tmp_path / "data"
-    db_path = data_root / "db" / "test.db"
+def setup_env(db_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    data_root = db_path.parents[1]
     monkeypatch.setenv("DATA_ROOT", str(data_root))
     monkeypatch.setenv("DB_PATH", str(db_path))
     load_config()  # create directories
-    init_db(db_path)
     return db_path
 
 
-def test_create_subject_inserts_row(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
-    setup_env(tmp_path, monkeypatch)
+def test_services_reuse_the_template_schema(fresh_db: Path, monkeypatch: pytest.MonkeyPatch):
+    from rag_assistant.db import sqlite as sqlite_mod
+
+    setup_env(fresh_db, monkeypatch)
+    monkeypatch.setattr(sqlite_mod, "apply_migrations", lambda *a: pytest.fail("schema setup re-ran on fresh_db"))
+    subject = subject_service.create_subject("Template")
+    asset_service.add_asset(subject["subject_id"], "notes.txt", b"template", "text/plain")
+
+
+def test_create_subject_inserts_row(fresh_db: Path, monkeypatch: pytest.MonkeyPatch):
+    setup_env(fresh_db, monkeypatch)
     subject = subject_service.create_subject("Machine Learning Fall 2025")
     subjects = subject_service.list_subjects()
     assert any(s["subject_id"] == subject["subject_id"] for s in subjects)
 
 
-def test_add_asset_saves_file_and_row(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
-    setup_env(tmp_path, monkeypatch)
+def test_create_subject_reuses_near_duplicate_name(fresh_db: Path, monkeypatch: pytest.MonkeyPatch):
+    setup_env(fresh_db, monkeypatch)
+    first = subject_service.create_subject("ML Fall 2025")
+    again = subject_service.create_subject("  ml, Fall 2025 ")
+    other = subject_service.create_subject("ML Spring 2026")
+    assert again["subject_id"] == first["subject_id"]
+    assert other["subject_id"] != first["subject_id"]
+    assert len(subject_service.list_subjects()) == 2
+
+
+@pytest.mark.parametrize("first_name, second_name", [("数学", "物理"), ("Физика", "Химия"), ("C++", "C#")])
+def test_create_subject_keeps_distinct_names_that_slugify_alike(fresh_db: Path, monkeypatch: pytest.MonkeyPatch, first_name: str, second_name: str):
+    setup_env(fresh_db, monkeypatch)
+    first = subject_service.create_subject(first_name)
+    second = subject_service.create_subject(second_name)
+    assert second["subject_id"] != first["subject_id"]
+    assert second["name"] == second_name
+    assert len(subject_service.list_subjects()) == 2
+
+
+@pytest.mark.parametrize("has_returning", [True, False])
+def test_add_asset_saves_file_and_row(fresh_db: Path, monkeypatch: pytest.MonkeyPatch, has_returning: bool):
+    setup_env(fresh_db, monkeypatch)
+    monkeypatch.setattr(asset_service, "_SQLITE_HAS_RETURNING", has_returning)
     subject = subject_service.create_subject("Physics")
     file_bytes = b"example content"
     asset = asset_service.add_asset(subject["subject_id"], "notes.txt", file_bytes, "text/plain")
@@ -41,3 +70,55 @@ def test_add_asset_saves_file_and_row(tmp_path: Path, monkeypatch: pytest.Monkey
     assets_after = asset_service.list_assets(subject["subject_id"])
     assert duplicate["asset_id"] == asset["asset_id"]
     assert len(assets_after) == 1
+
+
+def test_add_asset_drops_row_when_file_write_fails(fresh_db: Path, monkeypatch: pytest.MonkeyPatch):
+    setup_env(fresh_db, monkeypatch)
+    subject = subject_service.create_subject("Chemistry")
+
+    def fail_write(self, data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(Path, "write_bytes", fail_write)
+    with pytest.raises(OSError):
+        asset_service.add_asset(subject["subject_id"], "notes.txt", b"payload", "text/plain")
+    assert asset_service.list_assets(subject["subject_id"]) == []
+
+
+@pytest.mark.parametrize("as_bytesio", [True, False])
+def test_add_asset_streams_file_objects(fresh_db: Path, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, as_bytesio: bool):
+    setup_env(fresh_db, monkeypatch)
+    subject = subject_service.create_subject("Biology")
+    payload = b"x" * (3 * asset_service._COPY_CHUNK + 7)
+    source = tmp_path / "upload.bin"
+    source.write_bytes(payload)
+
+    with (io.BytesIO(payload) if as_bytesio else source.open("rb")) as fh:
+        fh.read(5)  # a partially read upload is still stored from the start
+        asset = asset_service.add_asset(subject["subject_id"], "big.bin", fh, None)
+
+    assert asset["asset_id"] == sha256(payload).hexdigest()[:16]
+    assert asset["size_bytes"] == len(payload)
+    assert Path(asset["stored_path"]).read_bytes() == payload
+
+
+def test_add_asset_retries_when_conflicting_row_vanishes(fresh_db: Path, monkeypatch: pytest.MonkeyPatch):
+    setup_env(fresh_db, monkeypatch)
+    monkeypatch.setattr(asset_service, "_SQLITE_HAS_RETURNING", True)
+    subject = subject_service.create_subject("Geology")
+    first = asset_service.add_asset(subject["subject_id"], "rocks.txt", b"rocks", "text/plain")
+    real_get = asset_service._get_asset
+    lookups = []
+
+    def deleted_meanwhile(asset_id):
+        # Simulate a concurrent cleanup removing the row between the conflict and the lookup.
+        if not lookups:
+            asset_service.execute(asset_service.get_db_path(), "DELETE FROM assets WHERE asset_id = ?;", (asset_id,))
+        lookups.append(asset_id)
+        return real_get(asset_id)
+
+    monkeypatch.setattr(asset_service, "_get_asset", deleted_meanwhile)
+    again = asset_service.add_asset(subject["subject_id"], "rocks.txt", b"rocks", "text/plain")
+    assert again["asset_id"] == first["asset_id"]
+    assert Path(again["stored_path"]).read_bytes() == b"rocks"
+    assert [a["asset_id"] for a in asset_service.list_assets(subject["subject_id"])] == [first["asset_id"]]
@@ -1,9 +1,10 @@
+import subprocess
+import sys
 import types
 import pytest
 
 from rag_assistant.ingest.ocr import tesseract as tess_mod
 from rag_assistant.ingest.ocr import factory
-from rag_assistant.config import load_config
 
 
 def test_normalize_lang():
@@ -11,43 +12,32 @@ def test_normalize_lang():
     assert tess_mod._normalize_lang("eng") == "eng"
 
 
-def test_resolve_tessdata_dir_prefers_common(monkeypatch):
-    cfg = load_config()
-    cfg.ingest.tesseract_cmd = "/opt/homebrew/bin/tesseract"
+def test_resolve_tessdata_dir_prefers_common(monkeypatch, settings, tmp_path):
+    prefix = tmp_path / "homebrew"
+    tessdata = prefix / "share" / "tessdata"
+    tessdata.mkdir(parents=True)
+    lang_file = tessdata / "eng.traineddata"
+    lang_file.write_bytes(b"")
+    cfg = settings
+    cfg.ingest.tesseract_cmd = str(prefix / "bin" / "tesseract")
+    cfg.ingest.tessdata_dir = ""
     cfg.ingest.ocr_lang = "en"
 
-    class FakePath:
-        def __init__(self, path: str):
-            self.path = path
-
-        def __truediv__(self, other):
-            return FakePath(f"{self.path}/{other}")
-
-        @property
-        def parent(self):
-            parts = self.path.rstrip('/').split('/')
-            return FakePath('/'.join(parts[:-1]) if len(parts) > 1 else '/')
-
-        @property
-        def name(self):
-            return self.path.rstrip('/').split('/')[-1]
-
-        def exists(self):
-            return self.path.endswith("eng.traineddata") or self.path.endswith("tessdata")
-
-        def __str__(self):
-            return self.path
-
-    monkeypatch.setattr(tess_mod, "Path", FakePath)
-    monkeypatch.setattr(tess_mod.shutil, "which", lambda name: cfg.ingest.tesseract_cmd)
+    monkeypatch.delenv("TESSDATA_PREFIX", raising=False)  # the engine exports it; restore on teardown
+    monkeypatch.setattr(tess_mod, "_TESSDATA_CACHE", {})
     monkeypatch.setattr(tess_mod.subprocess, "run", lambda *a, **k: types.SimpleNamespace(stdout=b"", stderr=b""))
     engine = tess_mod.TesseractOCREngine(lang="en", config=cfg)
-    assert "tessdata" in str(engine.tessdata_dir)
+    assert engine.tessdata_dir == tessdata
     assert engine.lang == "eng"
 
+    # A second engine reuses the resolved directory without probing the filesystem again.
+    lang_file.unlink()
+    again = tess_mod.TesseractOCREngine(lang="en", config=cfg)
+    assert again.tessdata_dir is engine.tessdata_dir
+
 
-def test_factory_no_fallback_for_explicit_tesseract(monkeypatch):
-    cfg = load_config()
+def test_factory_no_fallback_for_explicit_tesseract(monkeypatch, settings):
+    cfg = settings
     cfg.ingest.ocr_engine = "tesseract"
 
     def boom(*a, **k):
@@ -56,3 +46,13 @@ def test_factory_no_fallback_for_explicit_tesseract(monkeypatch):
     monkeypatch.setattr(factory, "TesseractOCREngine", boom)
     with pytest.raises(RuntimeError):
         factory.get_ocr_engine(lang="eng", config=cfg)
+
+
+def test_pytesseract_imported_on_first_access():
+    code = (
+        "import sys\n"
+        "from rag_assistant.ingest.ocr import tesseract as t\n"
+        "assert 'pytesseract' not in sys.modules\n"
+        "assert t.pytesseract is sys.modules['pytesseract']\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -1,4 +1,4 @@
-from types import SimpleNamespace
+import pytest
 
 from rag_assistant.web import search_client
 
@@ -42,3 +42,35 @@ def test_blocklist_filters(monkeypatch):
     res = search_client.search("q", config=DummyCfg(), allowlist=[], blocklist=["block.com"])
     assert len(res) == 1
     assert res[0].source == "allow.com"
+
+
+def test_no_lists_skips_filter_stage(monkeypatch):
+    results = [search_client.WebResult(title="A", url="http://allow.com/page", snippet="a", source="allow.com")]
+    monkeypatch.setattr(
+        search_client,
+        "_serpapi_search",
+        lambda query, api_key=None, max_results=None, timeout_s=None: list(results),
+    )
+    monkeypatch.setattr(search_client, "_filter_results", lambda *a: pytest.fail("filter stage should be skipped"))
+    assert search_client.search("q", config=DummyCfg(), allowlist=[], blocklist=None) == results
+
+
+def test_filter_rules_compiled_once_and_suffix_matched():
+    results = [
+        search_client.WebResult(title="A", url="http://docs.allow.com/x", snippet="a", source="docs.allow.com"),
+        search_client.WebResult(title="B", url="http://ads.allow.com/x", snippet="b", source="ads.allow.com"),
+        search_client.WebResult(title="C", url="http://other.org/x", snippet="c", source=""),
+    ]
+    allow = [" Allow.com ", "allow.com"]
+    kept = search_client._filter_results(results, allow, ["ads.allow.com"])
+    assert [r.title for r in kept] == ["A"]
+    assert search_client._compile_rules(allow).suffixes == ("allow.com",)
+    assert search_client._compile_rules(allow) is search_client._compile_rules(list(allow))
+
+
+def test_long_blocklist_uses_set_probe_with_same_semantics():
+    block = [f"site{i}.example.com" for i in range(200)] + ["ads.net", "tracker.io"]
+    rules = search_client._compile_rules(block)
+    assert len(rules.suffixes) > search_client._SET_PROBE_MIN_RULES
+    for domain in ["site7.example.com", "www.site7.example.com", "xads.net", "tracker.io.evil.com", "example.com", ""]:
+        assert rules.matches(domain) == domain.endswith(tuple(block))
@@ -1,4 +1,6 @@
+import json
 import types
+
 import pytest
 
 from rag_assistant.web import search_client
@@ -15,15 +17,20 @@ class DummyCfg:
     web = Web()
 
 
+_BODY = {"organic_results": [{"title": "Result", "link": "http://example.com", "snippet": "Snippet", "source": "example.com"}]}
+_OK = types.SimpleNamespace(status_code=200, content=json.dumps(_BODY).encode(), json=lambda: _BODY)
+
+
+def _fake_get(url, params=None, timeout=None):
+    assert "serpapi.com" in url
+    return _OK
+
+
+_FAKE_SESSION = types.SimpleNamespace(get=_fake_get)
+
+
 def test_search_success(monkeypatch):
-    def fake_get(url, params=None, timeout=None):
-        assert "serpapi.com" in url
-        return types.SimpleNamespace(
-            status_code=200,
-            json=lambda: {"organic_results": [{"title": "Result", "link": "http://example.com", "snippet": "Snippet", "source": "example.com"}]},
-        )
-
-    monkeypatch.setattr(search_client.requests, "get", fake_get)
+    monkeypatch.setattr(search_client, "_get_session", lambda: _FAKE_SESSION)
     results = search_client.search("test", config=DummyCfg())
     assert results
     assert results[0].url == "http://example.com"
@@ -31,7 +38,40 @@ def test_search_success(monkeypatch):
 
 def test_search_missing_key(monkeypatch):
     cfg = DummyCfg()
-    cfg.web.api_key = ""
-    monkeypatch.setattr(search_client.requests, "get", lambda *a, **k: None)
-    with pytest.raises(search_client.WebSearchError):
+    monkeypatch.setattr(cfg.web, "api_key", "")
+    monkeypatch.setattr(search_client, "_get_session", lambda: _FAKE_SESSION)
+    with pytest.raises(search_client.WebSearchError, match="key missing"):
         search_client.search("test", config=cfg)
+
+
+def test_session_is_shared(monkeypatch):
+    monkeypatch.setattr(search_client, "_SESSION", None)
+    first = search_client._get_session()
+    assert search_client._get_session() is first
+    adapter = first.get_adapter("https://serpapi.com/search")
+    assert adapter._pool_maxsize == search_client._POOL_MAXSIZE
+    assert adapter.max_retries.connect == 2
+    assert adapter.max_retries.read == 0
+    assert adapter.max_retries.status == 0
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_loads_with_and_without_orjson(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(search_client, "orjson", None)
+    assert search_client._loads(b'{"organic_results": [{"title": "caf\\u00e9"}]}') == {"organic_results": [{"title": "café"}]}
+
+
+def test_invalid_json_raises_search_error(monkeypatch):
+    bad = types.SimpleNamespace(status_code=200, content=b"<html>", text="<html>")
+    monkeypatch.setattr(search_client, "_get_session", lambda: types.SimpleNamespace(get=lambda *a, **k: bad))
+    with pytest.raises(search_client.WebSearchError, match="Invalid JSON"):
+        search_client.search("test", config=DummyCfg())
+
+
+def test_requests_exposed_lazily():
+    import requests
+
+    assert search_client.requests is requests